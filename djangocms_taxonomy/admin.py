@@ -1,5 +1,6 @@
-from django.contrib import admin
 from django.apps import apps as django_apps
+from django.contrib import admin
+from django.db.models import BooleanField, Exists, OuterRef, Value
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
@@ -10,6 +11,13 @@ from urllib.parse import urlparse
 from .models import Category
 
 
+# Typical admin change URL (path): /admin/<app>/<model>/<id>/change/
+_ADMIN_CHANGE_RE = re.compile(r"/(\d+)/change/?$")
+
+# Non-breaking space indentation (4 spaces per level) for the first 64 tree levels
+_INDENT_CACHE = [mark_safe("&nbsp;" * 4 * depth) for depth in range(64)]
+
+
 @admin.register(Category)
 class CategoryAdmin(TranslatableAdmin):
     """Admin interface for Category model with hierarchical display."""
@@ -28,26 +36,37 @@ class CategoryAdmin(TranslatableAdmin):
         return [error for error in errors if error.id != "admin.E030"]
 
     def __init__(self, *args, **kwargs):
-        """Initialize admin with sorting by path flag."""
+        """Initialize admin and precompute the ordering index of the indented name column."""
         super().__init__(*args, **kwargs)
-        self._is_sorted_by_path = True  # Default to True (show indentation)
-
-    def changelist_view(self, request, extra_context=None):
-        """Override to track if sorting is by path."""
-        # Check the 'o' parameter (ordering) from request
-        # path field ordering parameter is typically 'path' or '-path'
-        ordering_param = request.GET.get("o", "")
-        # Check if sorting by path (with or without descending)
-        self._is_sorted_by_path = (
-            ordering_param.startswith(str(self.list_display.index("indented_name") + 1)) or not ordering_param
-        )
-        return super().changelist_view(request, extra_context)
+        # Changelist ordering parameter ("o") value of the indented name column
+        self._indented_name_ord_idx = str(self.list_display.index("indented_name") + 1)
 
     def get_queryset(self, request):
         """Override queryset to add CTE annotations for path and depth."""
         qs = super().get_queryset(request)
-        # Add tree fields with path and depth for hierarchical ordering
-        return qs.with_tree_fields()
+        # Check the 'o' parameter (ordering) from request: indentation only makes
+        # sense if sorting by path (with or without descending). The flag travels
+        # with the rows instead of living on the admin instance, which is shared
+        # between threads.
+        ordering_param = request.GET.get("o")
+        is_sorted_by_path = not ordering_param or ordering_param.startswith(self._indented_name_ord_idx)
+        # The recursive CTE is only needed while path is one of the sort
+        # columns; otherwise the changelist neither orders nor indents by it.
+        if not is_sorted_by_path and self._indented_name_ord_idx not in (
+            column.lstrip("-") for column in ordering_param.split(".")
+        ):
+            return qs.prefetch_related("translations").annotate(
+                _is_sorted_by_path=Value(False, output_field=BooleanField())
+            )
+        # Add tree fields with path and depth for hierarchical ordering; the
+        # names shown by indented_name come from one translations prefetch.
+        return (
+            qs.with_tree_fields()
+            .prefetch_related("translations")
+            .annotate(
+                _is_sorted_by_path=Value(is_sorted_by_path, output_field=BooleanField()),
+            )
+        )
 
     def get_form(self, request, obj=None, **kwargs):
         form = super().get_form(request, obj=obj, **kwargs)
@@ -55,11 +74,26 @@ class CategoryAdmin(TranslatableAdmin):
         # Prevent cycles: a category cannot be its own parent, nor can it be
         # placed under any of its descendants.
         if obj is not None and "parent" in form.base_fields:
-            excluded_ids = Category.objects.descendants_of(obj, include_self=True).values_list("pk", flat=True)
-            form.base_fields["parent"].queryset = Category.objects.exclude(pk__in=excluded_ids)
+            excluded_ids = self._get_excluded_descendant_ids(request, obj.pk)
+            form.base_fields["parent"].queryset = form.base_fields["parent"].queryset.exclude(pk__in=excluded_ids)
 
         return form
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if (
+            db_field.name == "parent"
+            and "queryset" not in kwargs
+            and db_field.name not in self.get_autocomplete_fields(request)
+            and db_field.name not in self.raw_id_fields
+        ):
+            # Option labels (Category.__str__) read the name of the category and
+            # of its parent; load both with the options instead of per option.
+            # Autocomplete and raw id widgets render no options.
+            kwargs["queryset"] = Category.objects.select_related("parent").prefetch_related(
+                "translations", "parent__translations"
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
     def get_search_results(self, request, queryset, search_term):
         queryset, use_distinct = super().get_search_results(request, queryset, search_term)
 
@@ -68,25 +102,35 @@ class CategoryAdmin(TranslatableAdmin):
             object_id = request.GET.get("object_id")
             if not object_id:
                 referer = request.META.get("HTTP_REFERER", "")
-                # Typical admin change URL (path): /admin/<app>/<model>/<id>/change/
                 # The referer can have any scheme/host/prefix and may include a querystring.
                 referer_path = urlparse(referer).path
-                match = re.search(r"/(?P<object_id>\d+)/change/?$", referer_path)
+                match = _ADMIN_CHANGE_RE.search(referer_path)
                 if match:
-                    object_id = match.group("object_id")
-            if object_id:
-                try:
-                    current = Category.objects.get(pk=object_id)
-                except (Category.DoesNotExist, ValueError, TypeError):
-                    current = None
-
-                if current is not None:
-                    excluded_ids = Category.objects.descendants_of(current, include_self=True).values_list(
-                        "pk", flat=True
-                    )
-                    queryset = queryset.exclude(pk__in=excluded_ids)
+                    object_id = match.group(1)
+            try:
+                object_id = int(object_id)
+            except (TypeError, ValueError):
+                object_id = None
+            if object_id is not None:
+                # Exclude the subtree in the same statement as the search: the
+                # autocomplete view runs this once per keystroke.
+                subtree = Category.objects.descendant_ids_query([object_id], include_self=True)
+                queryset = queryset.filter(~Exists(subtree.filter(id=OuterRef("pk"))))
         return queryset, use_distinct
 
+    def _get_excluded_descendant_ids(self, request, obj_pk):
+        """Return the pks of a category and its descendants, cached on the request.
+
+        The list is materialized so the recursive CTE runs once and later
+        ``exclude(pk__in=...)`` filters use a literal IN-list.
+        """
+        cache = getattr(request, "_taxonomy_excluded_cache", None)
+        if cache is None:
+            cache = request._taxonomy_excluded_cache = {}
+        if obj_pk not in cache:
+            cache[obj_pk] = Category.objects.descendant_ids_of(obj_pk, include_self=True)
+        return cache[obj_pk]
+
     @admin.display(
         description=_("Name"),
         ordering="path",
@@ -94,18 +138,21 @@ class CategoryAdmin(TranslatableAdmin):
     def indented_name(self, obj):
         """Display name with indentation based on depth in hierarchy."""
         # Only add indentation if sorting by path
-        if hasattr(obj, "depth") and self._is_sorted_by_path:
-            # Use non-breaking spaces for indentation (4 spaces per level)
-            indent = "&nbsp;" * 4 * obj.depth
-            return format_html("{}{}", mark_safe(indent), obj.name)
+        depth = getattr(obj, "depth", None)
+        if depth is not None and getattr(obj, "_is_sorted_by_path", True):
+            indent = _INDENT_CACHE[depth] if depth < len(_INDENT_CACHE) else mark_safe("&nbsp;" * 4 * depth)
+            return format_html("{}{}", indent, obj.name)
         return obj.name
 
 
 if django_apps.is_installed("taggit"):
+    # Import taggit's admin first so its registrations exist whatever the
+    # order of INSTALLED_APPS; autodiscover() will not import it again.
+    import taggit.admin  # noqa: F401
     from taggit.models import Tag, TaggedItem
 
-    # If taggit registered its own admin elsewhere, remove it so the proxy
-    # models below show up under the Taxonomy app.
+    # Remove taggit's own admin so the proxy models below show up under the
+    # Taxonomy app.
     try:
         admin.site.unregister(Tag)
     except admin.sites.NotRegistered:
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 from django.utils.translation import gettext_lazy as _
 
 
@@ -6,3 +7,10 @@ class DjangoTaxonomyConfig(AppConfig):
     name = "djangocms_taxonomy"
     verbose_name = _("Taxonomy")
     default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        from .mixins import clear_content_type_cache
+
+        # Content types may be created or renumbered by migrations (e.g. when
+        # the test database is set up), so drop cached instances afterwards.
+        post_migrate.connect(clear_content_type_cache, dispatch_uid="djangocms_taxonomy_clear_content_type_cache")
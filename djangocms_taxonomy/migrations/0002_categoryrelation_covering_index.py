@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("djangocms_taxonomy", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="categoryrelation",
+            name="djangocms_t_content_eeb0c3_idx",
+        ),
+        migrations.AddIndex(
+            model_name="categoryrelation",
+            index=models.Index(
+                fields=["content_type", "object_id"], include=("category", "order"), name="catrel_ct_obj_cover"
+            ),
+        ),
+    ]
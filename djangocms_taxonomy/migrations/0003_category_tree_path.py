@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:35
+
+from django.db import migrations, models
+
+
+def fill_tree_paths(apps, schema_editor):
+    Category = apps.get_model("djangocms_taxonomy", "Category")
+    parents = dict(Category.objects.values_list("pk", "parent_id"))
+    paths = {}
+
+    def path_of(pk):
+        if pk not in paths:
+            parent_id = parents[pk]
+            paths[pk] = f"{path_of(parent_id) if parent_id else '/'}{pk}/"
+        return paths[pk]
+
+    # Paths that do not fit the column are left empty instead of failing the
+    # migration: they are only read when TAXONOMY_USE_MATERIALIZED_PATH is on.
+    categories = [
+        Category(pk=pk, tree_path=path_of(pk), tree_depth=path_of(pk).count("/") - 2)
+        for pk in parents
+        if len(path_of(pk)) <= 255
+    ]
+    Category.objects.bulk_update(categories, ["tree_path", "tree_depth"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("djangocms_taxonomy", "0002_categoryrelation_covering_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="tree_depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name="tree depth"),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="tree_path",
+            field=models.CharField(blank=True, default="", editable=False, max_length=255, verbose_name="tree path"),
+        ),
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(fields=["tree_path"], name="category_tree_path_idx", opclasses=["varchar_pattern_ops"]),
+        ),
+        migrations.RunPython(fill_tree_paths, migrations.RunPython.noop),
+    ]
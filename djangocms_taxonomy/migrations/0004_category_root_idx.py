@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("djangocms_taxonomy", "0003_category_tree_path"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                condition=models.Q(("parent__isnull", True)), fields=["parent"], name="category_root_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:45
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("djangocms_taxonomy", "0004_category_root_idx"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="categoryrelation",
+            options={
+                "ordering": ["order", "category_id"],
+                "verbose_name": "category relation",
+                "verbose_name_plural": "category relations",
+            },
+        ),
+    ]
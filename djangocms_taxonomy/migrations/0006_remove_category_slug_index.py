@@ -0,0 +1,16 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("djangocms_taxonomy", "0005_alter_categoryrelation_options"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="category",
+            name="djangocms_t_slug_805423_idx",
+        ),
+    ]
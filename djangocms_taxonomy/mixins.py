@@ -1,20 +1,48 @@
 """Model and admin mixins for category integration with Django models."""
 
+import copy
 from typing import TYPE_CHECKING, Any, Iterable
 
 from django import forms
 from django.contrib import admin
 from django.contrib.admin.widgets import FilteredSelectMultiple
+from django.contrib.contenttypes.fields import GenericRelation
 from django.contrib.contenttypes.models import ContentType
-from django.db import models
-from django.db.models import Model, QuerySet
+from django.db import connections, models, router, transaction
+from django.db.models import CharField, Exists, Model, OuterRef, Prefetch, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+from django.forms.models import ModelChoiceIterator
 from django.utils.translation import gettext_lazy as _
+from parler.utils.i18n import get_active_language_choices, get_language
 
 from .models import Category, CategoryRelation
 
 if TYPE_CHECKING:
     from django.db.models.manager import RelatedManager
 
+# Rows per INSERT/UPDATE statement for bulk writes of category relations,
+# keeping statements well below packet size and parameter limits.
+_BULK_BATCH_SIZE = 1000
+
+# ContentType per model class. Django's own ContentType cache is keyed by
+# app label and model name, which needs an _meta lookup and two dict hits on
+# every call; this one is a single lookup by class.
+_CT_CACHE: dict[type[Model], ContentType] = {}
+
+
+def _get_content_type(model: type[Model] | Model) -> ContentType:
+    """Return the (cached) ContentType for a model class or instance."""
+    cls = model if isinstance(model, type) else type(model)
+    content_type = _CT_CACHE.get(cls)
+    if content_type is None:
+        content_type = _CT_CACHE[cls] = ContentType.objects.get_for_model(cls)
+    return content_type
+
+
+def clear_content_type_cache(**kwargs: Any) -> None:
+    """Clear the ContentType cache, e.g. after migrations recreated content types."""
+    _CT_CACHE.clear()
+
 
 class CategoryManager:
     """
@@ -26,107 +54,260 @@ class CategoryManager:
 
     def __init__(self, instance: Model):
         self.instance = instance
-        self._content_type: ContentType | None = None
+        self._content_type: ContentType | None = _CT_CACHE.get(type(instance))
 
     @property
     def content_type(self) -> ContentType:
         if self._content_type is None:
-            self._content_type = ContentType.objects.get_for_model(self.instance)
+            self._content_type = _get_content_type(self.instance)
         return self._content_type
 
+    @property
+    def content_type_id(self) -> int:
+        # Filters use the raw id so the ORM compares a plain integer column
+        # instead of resolving a ContentType instance per lookup.
+        return self.content_type.pk
+
     def all(self) -> QuerySet[Category]:
         """Return all categories for this instance."""
         if not self.instance.pk:
             return Category.objects.none()
-        category_ids = CategoryRelation.objects.filter(
-            content_type=self.content_type,
+        prefetched = self._prefetched_relations()
+        if prefetched is not None:
+            # Serve the result from the prefetch cache, like Django's related managers do
+            categories = [relation.category for relation in prefetched]
+            queryset = Category.objects.filter(pk__in=[category.pk for category in categories])
+            queryset._result_cache = categories
+            queryset._prefetch_done = True
+            return queryset
+        # A single join against the (content_type, object_id) index instead of
+        # a pk__in subquery; the unique constraint rules out duplicate rows.
+        return Category.objects.filter(
+            relations__content_type_id=self.content_type_id,
+            relations__object_id=self.instance.pk,
+        ).order_by("relations__order")
+
+    def _prefetched_relations(self) -> list[CategoryRelation] | None:
+        """Return relations loaded by prefetch_related("category_relations"), if any."""
+        cache = getattr(self.instance, "_prefetched_objects_cache", None)
+        if cache and "category_relations" in cache:
+            return list(cache["category_relations"])
+        return None
+
+    def _remove_prefetched_relations(self) -> None:
+        """Drop prefetched relations before a write, like Django's related managers do."""
+        cache = getattr(self.instance, "_prefetched_objects_cache", None)
+        if cache:
+            cache.pop("category_relations", None)
+
+    def relations(self) -> QuerySet[CategoryRelation]:
+        """Return the CategoryRelation rows for this instance."""
+        if isinstance(self.instance, CategoryMixin):
+            return self.instance.category_relations.all()
+        return CategoryRelation.objects.filter(
+            content_type_id=self.content_type_id,
             object_id=self.instance.pk,
-        ).values_list("category_id", flat=True)
-        return Category.objects.filter(pk__in=category_ids)
+        )
 
     def add(self, *categories: Category) -> None:
         """Add one or more categories to this instance."""
+        self._remove_prefetched_relations()
         if not self.instance.pk:
             raise ValueError("Cannot add categories to unsaved instance")
-        existing = set(
-            CategoryRelation.objects.filter(
-                content_type=self.content_type,
-                object_id=self.instance.pk,
-                category__in=categories,
-            ).values_list("category_id", flat=True)
-        )
-        max_order = (
-            CategoryRelation.objects.filter(
-                content_type=self.content_type,
-                object_id=self.instance.pk,
-            ).aggregate(max_order=models.Max("order"))["max_order"]
-            or 0
-        )
-        new_relations = [
-            CategoryRelation(
-                category=cat,
-                content_type=self.content_type,
-                object_id=self.instance.pk,
-                order=max_order + i + 1,
+        with transaction.atomic():
+            # One locked read yields both the existing categories and the
+            # current maximum order, so concurrent adds cannot interleave.
+            orders = dict(
+                CategoryRelation.objects.select_for_update()
+                .filter(content_type_id=self.content_type_id, object_id=self.instance.pk)
+                .order_by()
+                .values_list("category_id", "order")
             )
-            for i, cat in enumerate(categories)
-            if cat.pk not in existing
-        ]
-        if new_relations:
-            CategoryRelation.objects.bulk_create(new_relations)
+            max_order = max(orders.values(), default=0)
+            new_relations = []
+            for category in categories:
+                if category.pk in orders:
+                    continue
+                max_order += 1
+                orders[category.pk] = max_order
+                new_relations.append(
+                    CategoryRelation(
+                        category=category,
+                        content_type_id=self.content_type_id,
+                        object_id=self.instance.pk,
+                        order=max_order,
+                    )
+                )
+            if new_relations:
+                CategoryRelation.objects.bulk_create(new_relations, ignore_conflicts=True, batch_size=_BULK_BATCH_SIZE)
 
     def remove(self, *categories: Category) -> None:
         """Remove one or more categories from this instance."""
+        self._remove_prefetched_relations()
         if not self.instance.pk:
             return
         CategoryRelation.objects.filter(
-            content_type=self.content_type,
+            content_type_id=self.content_type_id,
             object_id=self.instance.pk,
-            category__in=categories,
+            category_id__in={category.pk for category in categories},
         ).delete()
 
     def clear(self) -> None:
         """Remove all categories from this instance."""
+        self._remove_prefetched_relations()
         if not self.instance.pk:
             return
+        # Nothing cascades from CategoryRelation, so as long as no delete
+        # signal receivers are connected, Django's collector takes its fast
+        # path and issues a single DELETE without fetching primary keys.
+        # _raw_delete() would skip receivers added by projects, so it is not used.
         CategoryRelation.objects.filter(
-            content_type=self.content_type,
+            content_type_id=self.content_type_id,
             object_id=self.instance.pk,
         ).delete()
 
     def set(self, categories: Iterable[Category]) -> None:
-        """Replace all categories with the given ones."""
-        self.clear()
-        self.add(*categories)
+        """Replace all categories with the given ones, ordered as given.
+
+        Relations that are no longer wanted are deleted in one statement and
+        the remaining ones are upserted in another: existing rows keep their
+        primary key and only get their order updated.
+        """
+        self._remove_prefetched_relations()
+        if not self.instance.pk:
+            raise ValueError("Cannot set categories on unsaved instance")
+        categories = list({category.pk: category for category in categories}.values())
+        relations = [
+            CategoryRelation(
+                category=category,
+                content_type_id=self.content_type_id,
+                object_id=self.instance.pk,
+                order=order,
+            )
+            for order, category in enumerate(categories)
+        ]
+        features = connections[router.db_for_write(CategoryRelation)].features
+        with transaction.atomic():
+            CategoryRelation.objects.filter(content_type_id=self.content_type_id, object_id=self.instance.pk).exclude(
+                category_id__in=[category.pk for category in categories]
+            ).delete()
+            if not relations:
+                return
+            if features.supports_update_conflicts:
+                CategoryRelation.objects.bulk_create(
+                    relations,
+                    update_conflicts=True,
+                    # MySQL/MariaDB upsert on any unique key and reject a target
+                    unique_fields=(
+                        ["category", "content_type", "object_id"]
+                        if features.supports_update_conflicts_with_target
+                        else None
+                    ),
+                    update_fields=["order"],
+                    batch_size=_BULK_BATCH_SIZE,
+                )
+            else:
+                self._sync_orders(relations)
+
+    def _sync_orders(self, relations: list[CategoryRelation]) -> None:
+        """Insert missing relations and update changed orders without an upsert."""
+        existing = {
+            relation.category_id: relation
+            for relation in CategoryRelation.objects.filter(
+                content_type_id=self.content_type_id, object_id=self.instance.pk
+            )
+            .order_by()
+            .only("pk", "category_id", "order")
+        }
+        added = [relation for relation in relations if relation.category_id not in existing]
+        if added:
+            CategoryRelation.objects.bulk_create(added, batch_size=_BULK_BATCH_SIZE)
+        reordered = []
+        for relation in relations:
+            current = existing.get(relation.category_id)
+            if current is not None and current.order != relation.order:
+                current.order = relation.order
+                reordered.append(current)
+        if reordered:
+            CategoryRelation.objects.bulk_update(reordered, ["order"], batch_size=_BULK_BATCH_SIZE)
 
     def __iter__(self):
         return iter(self.all())
 
     def __bool__(self):
-        return self.all().exists()
+        # Existence and count only need the relation rows, not the categories
+        if not self.instance.pk:
+            return False
+        prefetched = self._prefetched_relations()
+        if prefetched is not None:
+            return bool(prefetched)
+        return self.relations().exists()
 
     def count(self) -> int:
-        return self.all().count()
+        if not self.instance.pk:
+            return 0
+        prefetched = self._prefetched_relations()
+        if prefetched is not None:
+            return len(prefetched)
+        return self.relations().count()
+
+    def filter(self, *args: Any, **kwargs: Any) -> QuerySet[Category]:
+        return self.all().filter(*args, **kwargs)
+
+    def exclude(self, *args: Any, **kwargs: Any) -> QuerySet[Category]:
+        return self.all().exclude(*args, **kwargs)
+
+    def order_by(self, *field_names: str) -> QuerySet[Category]:
+        return self.all().order_by(*field_names)
+
+    def values(self, *fields: str, **expressions: Any) -> QuerySet:
+        return self.all().values(*fields, **expressions)
+
+    def values_list(self, *fields: str, **kwargs: Any) -> QuerySet:
+        return self.all().values_list(*fields, **kwargs)
+
+    def exists(self) -> bool:
+        return bool(self)
+
+    def first(self) -> Category | None:
+        return self.all().first()
+
+    def get(self, *args: Any, **kwargs: Any) -> Category:
+        return self.all().get(*args, **kwargs)
 
     def __getattr__(self, name: str):
-        # Provide qs methods
+        # Proxy less common queryset methods. Private and special names are
+        # refused so that introspection (copy, pickle, hasattr probes) does
+        # not build a queryset.
+        if name.startswith("_"):
+            raise AttributeError(name)
         return getattr(self.all(), name)
 
 
 class CategoryDescriptor:
     """Descriptor that returns a CategoryManager for each instance."""
 
+    cache_name = "_categories_manager"
+
     def __get__(self, instance: Model | None, owner: type) -> "CategoryManager | RelatedManager[Category]":
         if instance is None:
             raise AttributeError("Cannot access categories from class, only from instances")
-        return CategoryManager(instance)
+        # The manager keeps no state besides the instance, so it can be reused
+        # for later accesses. Copied instances share __dict__ entries, hence
+        # the identity check.
+        manager = instance.__dict__.get(self.cache_name)
+        if manager is None or manager.instance is not instance:
+            manager = instance.__dict__[self.cache_name] = CategoryManager(instance)
+        return manager
 
 
 class CategoryMixin(models.Model):
     """
     Model mixin that adds M2M-like category management.
 
-    Provides a `categories` attribute with add/remove/set/clear methods.
+    Provides a `categories` attribute with add/remove/set/clear methods and a
+    `category_relations` generic relation that can be used with
+    `prefetch_related()`.
 
     Usage:
         class MyModel(CategoryMixin, models.Model):
@@ -144,41 +325,118 @@ class CategoryMixin(models.Model):
     class Meta:
         abstract = True
 
+    category_relations = GenericRelation("djangocms_taxonomy.CategoryRelation")
     categories = CategoryDescriptor()
 
 
+def _translated_name(category_ref: str, fallback: str) -> Coalesce:
+    """Return the category name in the active language or its fallbacks, or the slug."""
+    translation_model = Category._parler_meta.root_model
+    return Coalesce(
+        *(
+            Subquery(
+                translation_model.objects.filter(master=OuterRef(category_ref), language_code=language_code).values(
+                    "name"
+                )[:1]
+            )
+            for language_code in get_active_language_choices(get_language())
+        ),
+        fallback,
+        output_field=CharField(),
+    )
+
+
+class CategoryChoiceIterator(ModelChoiceIterator):
+    """
+    Choice iterator that builds option labels in SQL.
+
+    Yields ``(pk, label)`` tuples from a ``values_list()`` query instead of
+    instantiating a Category (and loading its translations) per option. Labels
+    match ``Category.__str__``.
+    """
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        queryset = self.queryset.prefetch_related(None)
+        if not queryset.ordered:
+            # Keep the options stable across databases
+            queryset = queryset.order_by("pk")
+        rows = queryset.annotate(
+            _choice_name=_translated_name("pk", "slug"),
+            _choice_parent_name=_translated_name("parent_id", "parent__slug"),
+        ).values_list("pk", "_choice_name", "_choice_parent_name")
+        for pk, name, parent_name in rows.iterator(chunk_size=2000):
+            yield (pk, f"{name} ({parent_name})" if parent_name else name)
+
+
+class CategoryMultipleChoiceField(forms.ModelMultipleChoiceField):
+    """Multiple choice field for categories that renders its options without model instances."""
+
+    iterator = CategoryChoiceIterator
+
+
+_CATEGORIES_FIELD: CategoryMultipleChoiceField | None = None
+
+
+def _categories_field() -> CategoryMultipleChoiceField:
+    """Return a copy of the form field used to select the categories of an object."""
+    global _CATEGORIES_FIELD
+    if _CATEGORIES_FIELD is None:
+        _CATEGORIES_FIELD = CategoryMultipleChoiceField(
+            # No tree fields: the widget does not indent its options, and
+            # labels are built by CategoryChoiceIterator. The explicit order
+            # keeps the options stable across databases.
+            queryset=Category.objects.order_by("pk"),
+            widget=FilteredSelectMultiple(
+                verbose_name=_("categories"),
+                is_stacked=False,
+            ),
+            required=False,
+            label=_("Categories"),
+            help_text=_("Select categories for this object"),
+        )
+    # Deep copy like Django does for declared fields: widgets carry attrs
+    # that forms modify per instance.
+    return copy.deepcopy(_CATEGORIES_FIELD)
+
+
 class CategoryFormMixin(forms.BaseModelForm):
     """Form mixin that adds category selection field to any model form."""
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         """Initialize form and populate categories field with existing relations."""
         super().__init__(*args, **kwargs)
+        self._content_type = _get_content_type(self.instance)
 
-        # Add categories field lazily to avoid app registry issues
+        # Forms built by CategoryAdminMixin declare the field on the class;
+        # other forms get it added here.
         if "categories" not in self.fields:
-            self.fields["categories"] = forms.ModelMultipleChoiceField(
-                queryset=Category.objects.all().with_tree_fields(),
-                widget=FilteredSelectMultiple(
-                    verbose_name=_("categories"),
-                    is_stacked=False,
-                ),
-                required=False,
-                label=_("Categories"),
-                help_text=_("Select categories for this object"),
-            )
+            self.fields["categories"] = _categories_field()
 
         # If editing an existing object, populate categories from relations
         if self.instance and self.instance.pk:
-            # Use the categories property if available (from CategoryMixin)
-            if hasattr(self.instance, "categories") and hasattr(self.instance.categories, "all"):
-                self.fields["categories"].initial = list(self.instance.categories.all())
+            prefetched = CategoryManager(self.instance)._prefetched_relations()
+            if prefetched is not None:
+                # Relations were prefetched (e.g. by CategoryAdminMixin.get_queryset)
+                self.fields["categories"].initial = [relation.category_id for relation in prefetched]
             else:
-                # Fallback to direct query if CategoryMixin is not used
-                related_categories = CategoryRelation.objects.filter(
-                    content_type=ContentType.objects.get_for_model(self.instance),
-                    object_id=self.instance.pk,
-                ).values_list("category_id", flat=True)
-                self.fields["categories"].initial = related_categories
+                # The widget only needs the selected primary keys
+                self.fields["categories"].initial = list(
+                    CategoryRelation.objects.filter(
+                        content_type=self._content_type,
+                        object_id=self.instance.pk,
+                    ).values_list("category_id", flat=True)
+                )
+
+
+_CATEGORIES_FIELDSET = (
+    _("Categories"),
+    {
+        "fields": ("categories",),
+        "classes": ("collapse",),
+    },
+)
 
 
 class CategoryAdminMixin:
@@ -204,7 +462,11 @@ class CategoryAdminMixin:
             self._selected_category: Category | None = None
             value = self.value()
             if value and value != "__none__" and str(value).isdigit():
-                self._selected_category = Category.objects.filter(pk=int(value)).first()
+                # Load the translations with the category so rendering
+                # selected_category_label needs no further query.
+                self._selected_category = (
+                    Category.objects.filter(pk=int(value)).prefetch_related("translations").first()
+                )
 
         @property
         def selected_category(self) -> Category | None:
@@ -230,15 +492,33 @@ class CategoryAdminMixin:
             if not value:
                 return queryset
 
-            content_type = ContentType.objects.get_for_model(queryset.model)
-            relations = CategoryRelation.objects.filter(content_type=content_type)
+            # Correlated EXISTS lets the database run a semi-join instead of
+            # materializing the list of related object ids.
+            relations = CategoryRelation.objects.filter(
+                content_type_id=_get_content_type(queryset.model).pk,
+                object_id=OuterRef("pk"),
+            )
 
             if value == "__none__":
-                related_object_ids = relations.values_list("object_id", flat=True)
-                return queryset.exclude(pk__in=related_object_ids)
-
-            related_object_ids = relations.filter(category_id=value).values_list("object_id", flat=True)
-            return queryset.filter(pk__in=related_object_ids)
+                return queryset.filter(~Exists(relations))
+
+            return queryset.filter(Exists(relations.filter(category_id=value)))
+
+    def get_queryset(self, request: Any) -> QuerySet:
+        """Prefetch category relations to avoid one query per changelist row."""
+        qs = super().get_queryset(request)  # type: ignore
+        if issubclass(qs.model, CategoryMixin):
+            qs = qs.prefetch_related(
+                Prefetch(
+                    "category_relations",
+                    # Prefetch translations too, so rendering category names
+                    # in list_display columns does not query per row.
+                    queryset=CategoryRelation.objects.select_related("category")
+                    .prefetch_related("category__translations")
+                    .order_by("order"),
+                )
+            )
+        return qs
 
     def get_list_filter(self, request: Any):
         list_filter = list(super().get_list_filter(request))  # type: ignore
@@ -263,10 +543,16 @@ class CategoryAdminMixin:
         # Create new form class that combines CategoryFormMixin with the base form
         # Preserve the Meta class from the original form
         class CombinedForm(CategoryFormMixin, form_class):  # type: ignore
-            pass
+            # Declared once per form class; Django copies declared fields
+            # into each form instance instead of building them in __init__.
+            categories = _categories_field()
 
         return CombinedForm
 
+    def get_fields(self, request: Any, obj: Model | None = None):
+        """Leave the categories field to its own fieldset (see get_fieldsets)."""
+        return [field for field in super().get_fields(request, obj) if field != "categories"]  # type: ignore
+
     def get_fieldsets(self, request: Any, obj: Model | None = None):
         """Add categories fieldset to the form, collapsed by default."""
         fieldsets = super().get_fieldsets(request, obj)  # type: ignore
@@ -274,21 +560,9 @@ class CategoryAdminMixin:
         if not fieldsets:
             return fieldsets
 
-        # Convert to mutable list
-        fieldsets_list = list(fieldsets)
-
-        # Add categories fieldset at the end, collapsed by default
-        fieldsets_list.append(
-            (
-                _("Categories"),
-                {
-                    "fields": ("categories",),
-                    "classes": ("collapse",),
-                },
-            )
-        )
-
-        return fieldsets_list
+        # Add categories fieldset at the end, collapsed by default. Callers may
+        # mutate the returned fieldsets, so hand out a copy of the shared one.
+        return [*fieldsets, copy.deepcopy(_CATEGORIES_FIELDSET)]
 
     def get_readonly_fields(self, request: Any, obj: Model | None = None) -> list[str]:
         """Get readonly fields, preserving parent class readonly fields."""
@@ -300,26 +574,12 @@ class CategoryAdminMixin:
         # Call parent save_related
         super().save_related(request, form, formsets, change)  # type: ignore
 
-        # Save category relations from the form
-        if form.instance.pk and hasattr(form, "cleaned_data"):
-            content_type = ContentType.objects.get_for_model(form.instance)
-
-            # Clear existing relations
-            CategoryRelation.objects.filter(
-                content_type=content_type,
-                object_id=form.instance.pk,
-            ).delete()
+        # Nothing to write if the selection is unchanged. The widget does not
+        # keep the selection order, so an unchanged set is an unchanged field.
+        if change and "categories" not in form.changed_data:
+            return
 
-            # Create new relations for selected categories
-            categories = form.cleaned_data.get("categories", [])
-            relations = [
-                CategoryRelation(
-                    category=category,
-                    content_type=content_type,
-                    object_id=form.instance.pk,
-                    order=order,
-                )
-                for order, category in enumerate(categories)
-            ]
-            if relations:
-                CategoryRelation.objects.bulk_create(relations)
+        # Save category relations from the form; set() only touches the
+        # rows that changed and keeps the submitted order.
+        if form.instance.pk and hasattr(form, "cleaned_data"):
+            CategoryManager(form.instance).set(form.cleaned_data.get("categories") or [])
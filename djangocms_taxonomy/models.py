@@ -1,14 +1,82 @@
+import functools
+import re
+import unicodedata
+from collections.abc import Iterable, Iterator
+from copy import copy
+
+from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
-from django.db.models import F, IntegerField, TextField, Value
-from django.db.models.functions import Concat
-from django.utils.text import slugify
+from django.db.models import Count, Exists, F, IntegerField, Max, OuterRef, Q, TextField, Value
+from django.db.models.functions import Concat, Substr
+from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 from django_cte import CTE, with_cte
 from parler.managers import TranslatableQuerySet
 from parler.models import TranslatableModel, TranslatedFields
 
+try:
+    from django.contrib.contenttypes.prefetch import GenericPrefetch
+except ImportError:  # Django < 5.0
+    GenericPrefetch = None
+
+
+_SLUG_STRIP_RE = re.compile(r"[^\w\s-]")
+_SLUG_DASH_RE = re.compile(r"[-\s]+")
+
+
+def _slugify(value: str) -> str:
+    """Same result as ``django.utils.text.slugify()``, without its lazy wrapper and regex cache lookups."""
+    value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
+    return _SLUG_DASH_RE.sub("-", _SLUG_STRIP_RE.sub("", value.lower())).strip("-_")
+
+
+# Per (database alias, language): ((category count, latest date_modified), categories)
+_TREE_CACHE: dict[tuple[str, str | None], tuple[tuple, list]] = {}
+
+
+def use_materialized_path() -> bool:
+    """Return whether descendant lookups read the stored tree path instead of running a CTE."""
+    return getattr(settings, "TAXONOMY_USE_MATERIALIZED_PATH", False)
+
+
+@functools.lru_cache(maxsize=8)
+def _tree_cte_for(model: type[models.Model]) -> CTE:
+    """Build the recursive tree CTE of ``model``; see ``CategoryQuerySet._tree_cte()``."""
+
+    # The CTE only carries what the recursion and the outer query need: the
+    # id to join on, the path and the depth. Each level reads slug and
+    # parent_id from the joined category row, and all other columns are read
+    # once by the outer join on id. The path is built from slugs, so no
+    # translation table is joined at any level.
+    def make_cte(cte) -> models.QuerySet:
+        # Non-recursive: get root nodes
+        return (
+            model._raw_objects.filter(parent__isnull=True)
+            .values(
+                "id",
+                path=F("slug"),
+                depth=Value(0, output_field=IntegerField()),
+            )
+            .union(
+                # Recursive: get descendants
+                cte.join(model._raw_objects.all(), parent_id=cte.col.id).values(
+                    "id",
+                    path=Concat(
+                        cte.col.path,
+                        Value("/"),
+                        F("slug"),
+                        output_field=TextField(),
+                    ),
+                    depth=cte.col.depth + Value(1, output_field=IntegerField()),
+                ),
+                all=True,
+            )
+        )
+
+    return CTE.recursive(make_cte)
+
 
 class CategoryQuerySet(TranslatableQuerySet):
     """
@@ -21,54 +89,13 @@ class CategoryQuerySet(TranslatableQuerySet):
         Annotate queryset with tree hierarchy fields using recursive CTE.
 
         Adds:
-        - path: Full hierarchical path (e.g., "Parent / Child / Grandchild")
+        - path: Slug path from the root (e.g., "parent/child/grandchild")
         - depth: Integer depth in the tree (root = 0)
 
         Returns:
             QuerySet annotated with path and depth, ordered hierarchically.
         """
-
-        def make_cte(cte) -> models.QuerySet:
-            # Non-recursive: get root nodes
-            return (
-                self.model.objects.filter(parent__isnull=True)
-                .order_by()
-                .values(  # Clear default ordering for UNION
-                    "id",
-                    "translations__name",
-                    "slug",
-                    "parent_id",
-                    "translations__description",
-                    "date_created",
-                    "date_modified",
-                    path=F("translations__name"),
-                    depth=Value(0, output_field=IntegerField()),
-                )
-                .union(
-                    # Recursive: get descendants
-                    cte.join(self.model, parent_id=cte.col.id)
-                    .order_by()
-                    .values(  # Clear default ordering for UNION
-                        "id",
-                        "translations__name",
-                        "slug",
-                        "parent_id",
-                        "translations__description",
-                        "date_created",
-                        "date_modified",
-                        path=Concat(
-                            cte.col.path,
-                            Value("/"),
-                            F("slug"),
-                            output_field=TextField(),
-                        ),
-                        depth=cte.col.depth + Value(1, output_field=IntegerField()),
-                    ),
-                    all=True,
-                )
-            )
-
-        cte = CTE.recursive(make_cte)
+        cte = self._tree_cte()
 
         return with_cte(
             cte,
@@ -80,6 +107,44 @@ class CategoryQuerySet(TranslatableQuerySet):
             .order_by("path"),
         )
 
+    def iter_tree(self, chunk_size: int = 2000) -> "Iterator[Category]":
+        """
+        Iterate over all categories with tree fields without caching them.
+
+        Streams rows in chunks instead of materializing the whole tree, e.g.
+        for exports of large taxonomies. On PostgreSQL this uses a
+        server-side cursor.
+
+        Args:
+            chunk_size: Number of rows fetched from the database at a time.
+
+        Returns:
+            Iterator of categories annotated with path and depth, in tree order.
+        """
+        return self.with_tree_fields().iterator(chunk_size=chunk_size)
+
+    def tree_fields_map(self) -> dict[int, tuple[str, int]]:
+        """
+        Return the tree fields of all categories as ``{pk: (path, depth)}``.
+
+        Runs the recursive CTE once without joining back to the category
+        table. Useful to decorate already loaded categories, e.g. a page of
+        results, without annotating the queryset itself.
+
+        Returns:
+            Dictionary mapping category primary keys to their path and depth.
+        """
+        cte = self._tree_cte()
+        rows = with_cte(cte, select=cte.queryset()).values_list("id", "path", "depth")
+        return {pk: (path, depth) for pk, path, depth in rows}
+
+    def _tree_cte(self) -> CTE:
+        # The CTE body only depends on the model, so it is built once and
+        # each caller gets its own copy of the query to attach and compile.
+        cte = copy(_tree_cte_for(self.model))
+        cte.query = cte.query.clone()
+        return cte
+
     def roots(self) -> "CategoryQuerySet":
         """
         Get all root categories (no parent).
@@ -96,7 +161,20 @@ class CategoryQuerySet(TranslatableQuerySet):
         Returns:
             QuerySet of leaf categories.
         """
-        return self.filter(children__isnull=True)
+        # NOT EXISTS instead of the LEFT JOIN implied by children__isnull,
+        # which also keeps the queryset free of joins for later filters
+        return self.filter(~Exists(self.model.objects.filter(parent_id=OuterRef("pk"))))
+
+
+class _RawCategoryManager(models.Manager):
+    """Plain manager for the parts of recursive CTEs.
+
+    Returns unordered, non-translatable querysets, so UNION branches need no
+    ``order_by()`` reset and skip parler's queryset machinery.
+    """
+
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().order_by()
 
 
 class CategoryManager(models.Manager.from_queryset(CategoryQuerySet)):
@@ -112,28 +190,167 @@ class CategoryManager(models.Manager.from_queryset(CategoryQuerySet)):
         Returns:
             QuerySet of descendant Category objects.
         """
+        return self.descendants_of_many([category], include_self=include_self)
+
+    def descendants_of_many(
+        self, categories: "Iterable[Category | int]", *, include_self: bool = False
+    ) -> "CategoryQuerySet":
+        """Return all descendants of several categories using a single recursive CTE.
+
+        Use this instead of calling ``descendants_of()`` in a loop, e.g. in
+        admin actions that operate on a selection of categories.
+
+        Args:
+            categories: Category instances or primary keys.
+            include_self: Include the given categories themselves in the result.
+
+        Returns:
+            QuerySet of descendant Category objects.
+        """
+        categories = list(categories)
+        if use_materialized_path():
+            queryset = self._descendants_by_path(categories, include_self=include_self)
+            if queryset is not None:
+                return queryset
+        cte = self._descendants_cte(categories, include_self=include_self)
+        return with_cte(cte, select=cte.join(self.model, id=cte.col.id))
 
-        category_id = category.pk if isinstance(category, Category) else int(category)
+    def descendant_ids_of(self, category: "Category | int", *, include_self: bool = False) -> list[int]:
+        """Return the primary keys of all descendants of a given category.
+
+        Reads the ids straight from the recursive CTE without joining back to
+        the category table, and materializes them so they can be passed to
+        ``pk__in`` filters as a literal list.
+
+        Args:
+            category: Category instance or primary key.
+            include_self: Include the given category itself in the result.
+
+        Returns:
+            List of descendant primary keys.
+        """
+        return list(self.descendant_ids_query([category], include_self=include_self))
+
+    def descendant_ids_query(
+        self, categories: "Iterable[Category | int]", *, include_self: bool = False
+    ) -> models.QuerySet:
+        """Return an unevaluated ``values_list("id", flat=True)`` query of descendant ids.
+
+        Use it as a subquery, e.g. ``exclude(pk__in=...)`` or inside
+        ``Exists()``, to filter by a subtree within the same SQL statement.
+
+        Args:
+            categories: Category instances or primary keys.
+            include_self: Include the given categories themselves in the result.
+
+        Returns:
+            QuerySet yielding descendant primary keys.
+        """
+        categories = list(categories)
+        if use_materialized_path():
+            queryset = self._descendants_by_path(categories, include_self=include_self)
+            if queryset is not None:
+                return queryset.values_list("id", flat=True)
+        cte = self._descendants_cte(categories, include_self=include_self)
+        return with_cte(cte, select=cte.queryset()).values_list("id", flat=True)
+
+    def cached_tree(self, *, max_size: int = 5000) -> "list[Category]":
+        """Return all categories with tree fields, cached in the current process.
+
+        Each call runs a single aggregate query for the number of categories
+        and the latest ``date_modified``. The recursive CTE only runs again
+        when one of them changed, i.e. after a category was saved, added or
+        deleted. ``queryset.update()`` does not touch ``date_modified``, so
+        tree changes made that way are not picked up.
+
+        The returned categories are shared between callers and must not be
+        modified.
+
+        Args:
+            max_size: Larger taxonomies are not cached and are read from the
+                database on every call.
+
+        Returns:
+            List of categories annotated with path and depth, in tree order.
+        """
+        state = self.aggregate(count=Count("pk"), modified=Max("date_modified"))
+        key = (state["count"], state["modified"])
+        # The categories keep the language that was active when they were
+        # loaded, so each language gets its own copy of the tree.
+        cache_key = (self.db, get_language())
+        cached = _TREE_CACHE.get(cache_key)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        tree = list(self.with_tree_fields())
+        if key[0] <= max_size:
+            _TREE_CACHE[cache_key] = (key, tree)
+        return tree
+
+    def rebuild_tree_paths(self) -> int:
+        """Recompute the stored tree path and depth of all categories.
+
+        Needed after writes that bypass ``Category.save()``, such as
+        ``bulk_create()`` or ``queryset.update(parent=...)``.
+
+        Returns:
+            Number of categories whose tree fields changed.
+        """
+        rows = {
+            pk: (parent_id, tree_path) for pk, parent_id, tree_path in self.values_list("pk", "parent_id", "tree_path")
+        }
+        paths: dict[int, str] = {}
+
+        def path_of(pk: int) -> str:
+            if pk not in paths:
+                parent_id = rows[pk][0]
+                paths[pk] = f"{path_of(parent_id) if parent_id else '/'}{pk}/"
+            return paths[pk]
+
+        changed = [
+            self.model(pk=pk, tree_path=path_of(pk), tree_depth=path_of(pk).count("/") - 2)
+            for pk, (_parent_id, tree_path) in rows.items()
+            if path_of(pk) != tree_path
+        ]
+        self.bulk_update(changed, ["tree_path", "tree_depth"], batch_size=1000)
+        return len(changed)
+
+    def _descendants_by_path(
+        self, categories: "list[Category | int]", *, include_self: bool
+    ) -> "CategoryQuerySet | None":
+        paths = [category.tree_path for category in categories if isinstance(category, Category)]
+        category_ids = [category for category in categories if not isinstance(category, Category)]
+        if category_ids:
+            paths += self.filter(pk__in=category_ids).values_list("tree_path", flat=True)
+        if "" in paths:
+            # A missing path would match every category: let the caller use the CTE
+            return None
+        condition = Q()
+        for path in paths:
+            condition |= Q(tree_path__startswith=path)
+        if not condition:
+            return self.none()
+        queryset = self.filter(condition)
+        return queryset if include_self else queryset.exclude(tree_path__in=paths)
+
+    def _descendants_cte(self, categories: "Iterable[Category | int]", *, include_self: bool) -> CTE:
+        category_ids = [category.pk if isinstance(category, Category) else int(category) for category in categories]
+        # Seed the CTE with the starting nodes (or their children) to keep
+        # everything inside a single WITH RECURSIVE expression. UNION (not
+        # UNION ALL) drops rows already produced, so overlapping subtrees are
+        # returned once without a DISTINCT on the result, and a parent cycle
+        # ends the recursion instead of looping.
+        seed = (
+            self.model._raw_objects.filter(id__in=category_ids)
+            if include_self
+            else self.model._raw_objects.filter(parent_id__in=category_ids)
+        )
 
         def make_cte(cte) -> models.QuerySet:
-            return (
-                # Seed the CTE with the starting node to keep everything inside
-                # a single WITH RECURSIVE expression.
-                self.model.objects.filter(id=category_id)
-                .order_by()
-                .values("id", "parent_id")
-                .union(
-                    cte.join(self.model, parent_id=cte.col.id).order_by().values("id", "parent_id"),
-                    all=True,
-                )
+            return seed.values("id").union(
+                cte.join(self.model._raw_objects.all(), parent_id=cte.col.id).values("id"),
             )
 
-        cte = CTE.recursive(make_cte)
-        qs = with_cte(cte, select=cte.join(self.model, id=cte.col.id)).distinct()
-        if include_self:
-            return qs
-        return qs.exclude(pk=category_id)
-
+        return CTE.recursive(make_cte)
 
 
 class Category(TranslatableModel):
@@ -166,7 +383,6 @@ class Category(TranslatableModel):
         _("slug"),
         max_length=255,
         unique=True,
-        db_index=True,
     )
 
     # Translatable fields
@@ -181,6 +397,22 @@ class Category(TranslatableModel):
         ),
     )
 
+    # Materialized path ("/<root pk>/.../<pk>/") and depth. Only kept up to
+    # date by save() and read by descendant lookups when
+    # TAXONOMY_USE_MATERIALIZED_PATH is enabled.
+    tree_path = models.CharField(
+        _("tree path"),
+        max_length=255,
+        blank=True,
+        default="",
+        editable=False,
+    )
+    tree_depth = models.PositiveSmallIntegerField(
+        _("tree depth"),
+        default=0,
+        editable=False,
+    )
+
     # Timestamps
     date_created = models.DateTimeField(
         _("created at"),
@@ -193,14 +425,21 @@ class Category(TranslatableModel):
 
     # Custom manager with optimizations
     objects = CategoryManager()
+    _raw_objects = _RawCategoryManager()
 
     class Meta:
         verbose_name = _("category")
         verbose_name_plural = _("categories")
 
         indexes = [
-            models.Index(fields=["slug"]),
+            # No index on slug: the unique constraint already provides one.
             models.Index(fields=["parent"]),
+            # Small partial index for roots(); backends without partial index
+            # support skip it.
+            models.Index(fields=["parent"], condition=Q(parent__isnull=True), name="category_root_idx"),
+            # Pattern ops let PostgreSQL use the index for LIKE 'prefix%' lookups
+            # regardless of the collation; other backends ignore opclasses.
+            models.Index(fields=["tree_path"], name="category_tree_path_idx", opclasses=["varchar_pattern_ops"]),
         ]
 
     def save(self, *args, **kwargs) -> None:
@@ -212,8 +451,40 @@ class Category(TranslatableModel):
             **kwargs: Additional keyword arguments.
         """
         if not self.slug and self.name:
-            self.slug = slugify(self.name)
+            self.slug = _slugify(self.name)
         super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if use_materialized_path() and (
+            update_fields is None or "parent" in update_fields or "parent_id" in update_fields
+        ):
+            self._update_tree_path()
+
+    def _update_tree_path(self) -> None:
+        """Store the materialized path and depth, moving the subtree along if needed."""
+        # Read both paths from the database: the instances in memory may be
+        # stale, e.g. after the parent itself was moved.
+        pks = [self.pk, self.parent_id] if self.parent_id else [self.pk]
+        stored = dict(Category._raw_objects.filter(pk__in=pks).values_list("pk", "tree_path"))
+        parent_path = stored.get(self.parent_id, "") if self.parent_id else "/"
+        if not parent_path:
+            # The paths were not maintained while TAXONOMY_USE_MATERIALIZED_PATH
+            # was off, so the parent cannot be trusted: recompute all of them.
+            Category.objects.rebuild_tree_paths()
+            self.tree_path, self.tree_depth = (
+                Category._raw_objects.filter(pk=self.pk).values_list("tree_path", "tree_depth").get()
+            )
+            return
+        tree_path = f"{parent_path}{self.pk}/"
+        old_path = stored.get(self.pk, "")
+        tree_depth = tree_path.count("/") - 2
+        if tree_path != old_path:
+            Category.objects.filter(pk=self.pk).update(tree_path=tree_path, tree_depth=tree_depth)
+            if old_path:
+                Category.objects.filter(tree_path__startswith=old_path).exclude(pk=self.pk).update(
+                    tree_path=Concat(Value(tree_path), Substr("tree_path", len(old_path) + 1)),
+                    tree_depth=F("tree_depth") + (tree_depth - (old_path.count("/") - 2)),
+                )
+        self.tree_path, self.tree_depth = tree_path, tree_depth
 
     def __str__(self) -> str:
         """
@@ -225,6 +496,48 @@ class Category(TranslatableModel):
         return f"{self.name} ({self.parent.name})" if self.parent else self.name
 
 
+class CategoryRelationQuerySet(models.QuerySet):
+    """QuerySet for CategoryRelation."""
+
+    def ordered_by_name(self) -> "list[CategoryRelation]":
+        """
+        Return the relations sorted by order, then by translated category name.
+
+        The default ordering does not involve the translation table; the
+        names are prefetched and compared in Python instead, so use this on
+        small result sets such as the relations of one object or one page.
+
+        Returns:
+            List of relations with their categories and translations loaded.
+        """
+        relations = self.select_related("category").prefetch_related("category__translations")
+        return sorted(
+            relations,
+            key=lambda relation: (
+                relation.order,
+                relation.category.safe_translation_getter("name", any_language=True) or relation.category.slug,
+            ),
+        )
+
+    def with_content_objects(self, *querysets: models.QuerySet) -> "CategoryRelationQuerySet":
+        """
+        Prefetch the related objects with one query per content type.
+
+        Optional querysets, one per model, e.g. with their own
+        ``select_related()``, are used to load the objects of that model.
+        They require Django 5.0 or later and are ignored on older versions.
+
+        Args:
+            *querysets: Querysets used for the objects of their model.
+
+        Returns:
+            QuerySet with ``content_object`` prefetched.
+        """
+        if querysets and GenericPrefetch is not None:
+            return self.prefetch_related(GenericPrefetch("content_object", list(querysets)))
+        return self.prefetch_related("content_object")
+
+
 class CategoryRelation(models.Model):
     """
     Intermediary model for generic many-to-many relationships between
@@ -261,12 +574,23 @@ class CategoryRelation(models.Model):
         help_text=_("Order of this category for the related object"),
     )
 
+    objects = CategoryRelationQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("category relation")
         verbose_name_plural = _("category relations")
-        ordering = ["order", "category__translations__name"]
+        # No translated column here: it would join the translation table into
+        # every relation query. See CategoryRelationQuerySet.ordered_by_name().
+        ordering = ["order", "category_id"]
         indexes = [
-            models.Index(fields=["content_type", "object_id"]),
+            # Covers the category id and order, so listing an object's
+            # categories can be an index-only scan on PostgreSQL (INCLUDE is
+            # ignored by other backends).
+            models.Index(
+                fields=["content_type", "object_id"],
+                include=["category", "order"],
+                name="catrel_ct_obj_cover",
+            ),
             models.Index(fields=["category", "content_type"]),
         ]
         constraints = [
@@ -0,0 +1,35 @@
+"""Shared pytest fixtures."""
+
+from collections import namedtuple
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+
+from tests.test_app.models import TestModel
+from tests.utils import make_categories
+
+BaseCategories = namedtuple("BaseCategories", ["cat1", "cat2", "cat3"])
+
+
+@pytest.fixture(scope="class")
+def base_categories(django_db_setup, django_db_blocker):
+    """
+    Three root categories with English names, created once per test class.
+
+    Like ``TestCase.setUpTestData()``, the rows live in a transaction that is
+    rolled back after the class; each test runs in a savepoint inside it. The
+    instances are shared by all tests of the class: a test that modifies one
+    must restore it with ``refresh_from_db()``.
+    """
+    with django_db_blocker.unblock(), transaction.atomic():
+        categories = make_categories([("cat1", "Category 1"), ("cat2", "Category 2"), ("cat3", "Category 3")])
+        yield BaseCategories(*categories)
+        transaction.set_rollback(True)
+
+
+@pytest.fixture(scope="module")
+def test_model_ct(django_db_setup, django_db_blocker):
+    """Content type of ``TestModel``, looked up once per test module."""
+    with django_db_blocker.unblock():
+        return ContentType.objects.get_for_model(TestModel)
@@ -104,4 +104,7 @@ PARLER_LANGUAGES = {
 }
 
 PARLER_DEFAULT_LANGUAGE_CODE = "en"
+# Cached translations would outlive the per-test rollback and leak into
+# later tests that reuse the same primary keys.
+PARLER_ENABLE_CACHING = False
 CMS_PERMISSION = True
@@ -1,5 +1,7 @@
 """Tests for admin interface."""
 import pytest
+from django.apps import apps
+from django.contrib import admin
 from django.contrib.admin.sites import AdminSite
 from django.contrib.auth import get_user_model
 from django.test import RequestFactory
@@ -29,6 +31,15 @@ class TestCategoryAdmin:
         assert isinstance(self.admin, CategoryAdmin)
         assert self.admin.model == Category
 
+    def test_taggit_admin_replaced_by_proxy(self):
+        """Test that taggit's Tag admin is replaced by the Taxonomy proxy admin."""
+        if not apps.is_installed("taggit"):
+            pytest.skip("taggit is not installed")
+        from taggit.models import Tag
+
+        assert Tag not in admin.site._registry
+        assert any(model._meta.proxy and issubclass(model, Tag) for model in admin.site._registry)
+
     def test_list_display(self):
         """Test list_display configuration."""
         expected = ["indented_name", "slug", "parent", "date_created"]
@@ -174,6 +185,20 @@ class TestCategoryAdmin:
         assert "slug" in self.admin.prepopulated_fields
         assert self.admin.prepopulated_fields["slug"] == ("name",)
 
+    def test_parent_field_prefetches_only_for_select_widget(self):
+        """Translations are only prefetched when the parent options are rendered."""
+        request = self.factory.get("/admin/djangocms_taxonomy/category/add/")
+        request.user = self.user
+        db_field = Category._meta.get_field("parent")
+
+        field = self.admin.formfield_for_foreignkey(db_field, request)
+        assert not field.queryset._prefetch_related_lookups
+
+        select_admin = CategoryAdmin(Category, self.site)
+        select_admin.autocomplete_fields = []
+        field = select_admin.formfield_for_foreignkey(db_field, request)
+        assert "translations" in field.queryset._prefetch_related_lookups
+
     def test_parent_field_excludes_self_and_descendants(self):
         """Parent selection must not allow cycles (self/descendants)."""
         root = Category.objects.create(slug="root")
@@ -208,6 +233,23 @@ class TestCategoryAdmin:
         assert child not in parent_qs
         assert grandchild not in parent_qs
 
+    def test_parent_field_labels_need_no_query_per_option(self, django_assert_num_queries):
+        """Parent option labels are built from prefetched translations."""
+        root = Category.objects.language("en").create(slug="root", name="Root")
+        for i in range(5):
+            Category.objects.language("en").create(slug=f"child{i}", name=f"Child {i}", parent=root)
+
+        request = self.factory.get("/admin/djangocms_taxonomy/category/add/")
+        request.user = self.user
+        # Render the parent as a select instead of the autocomplete widget
+        self.admin.autocomplete_fields = []
+        form = self.admin.get_form(request)()
+
+        with django_assert_num_queries(3):
+            labels = [str(category) for category in form.fields["parent"].queryset]
+
+        assert "Child 0 (Root)" in labels
+
     def test_parent_autocomplete_search_excludes_self_and_descendants(self):
         root = Category.objects.create(slug="root")
         root.set_current_language("en")
@@ -242,7 +284,55 @@ class TestCategoryAdmin:
         request.META["HTTP_REFERER"] = f"/admin/djangocms_taxonomy/category/{child.pk}/change/"
 
         qs, _use_distinct = self.admin.get_search_results(request, Category.objects.all(), "")
-        assert child not in qs
-        assert grandchild not in qs
-        assert root in qs
-        assert other_root in qs
+        assert set(qs) == {root, other_root}
+
+    def test_parent_autocomplete_search_is_a_single_query(self, django_assert_num_queries):
+        root = Category.objects.create(slug="root")
+        child = Category.objects.create(slug="child", parent=root)
+
+        request = self.factory.get("/admin/autocomplete/", {"field_name": "parent", "object_id": str(child.pk)})
+        request.user = self.user
+
+        with django_assert_num_queries(1):
+            qs, _use_distinct = self.admin.get_search_results(request, Category.objects.all(), "")
+            assert list(qs) == [root]
+
+    def test_parent_autocomplete_search_ignores_invalid_object_id(self):
+        root = Category.objects.create(slug="root")
+        child = Category.objects.create(slug="child", parent=root)
+
+        request = self.factory.get(
+            "/admin/autocomplete/",
+            {"field_name": "parent", "object_id": "not-a-number", "term": ""},
+        )
+        request.user = self.user
+
+        qs, _use_distinct = self.admin.get_search_results(request, Category.objects.all(), "")
+        assert set(qs) == {root, child}
+
+        request = self.factory.get("/admin/autocomplete/", {"field_name": "parent", "object_id": str(child.pk)})
+        request.user = self.user
+
+        qs, _use_distinct = self.admin.get_search_results(request, Category.objects.all(), "")
+        assert set(qs) == {root}
+
+    def test_indented_name_without_path_ordering(self):
+        """Indentation is dropped when the changelist is sorted by another column."""
+        root = Category.objects.language("en").create(slug="root", name="Root")
+        Category.objects.language("en").create(slug="child", name="Child", parent=root)
+
+        request = self.factory.get("/admin/djangocms_taxonomy/category/", {"o": "2"})
+        request.user = self.user
+        obj = self.admin.get_queryset(request).get(slug="child")
+
+        assert self.admin.indented_name(obj) == "Child"
+
+    def test_get_queryset_skips_tree_fields_without_path_ordering(self):
+        """The recursive CTE is only added while path is a sort column."""
+        request = self.factory.get("/admin/djangocms_taxonomy/category/", {"o": "2"})
+        request.user = self.user
+        assert "WITH RECURSIVE" not in str(self.admin.get_queryset(request).query).upper()
+
+        request = self.factory.get("/admin/djangocms_taxonomy/category/", {"o": "2.-1"})
+        request.user = self.user
+        assert "WITH RECURSIVE" in str(self.admin.get_queryset(request).query).upper()
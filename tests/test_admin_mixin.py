@@ -5,6 +5,7 @@ from django.contrib.admin.sites import AdminSite
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.test import RequestFactory
+from django.utils import translation
 
 from djangocms_taxonomy.mixins import CategoryAdminMixin
 from djangocms_taxonomy.models import Category, CategoryRelation
@@ -215,8 +216,172 @@ class TestCategoryAdminMixin:
         qs_none = flt_none.queryset(request_none, TestModel.objects.all())
         assert list(qs_none.order_by("pk").values_list("pk", flat=True)) == [obj_without_cat.pk]
 
+    def test_category_list_filter_label_needs_no_extra_query(self, django_assert_num_queries) -> None:
+        from tests.test_app.admin import TestModelAdmin
+
+        admin_instance = TestModelAdmin(TestModel, AdminSite())
+        request = self.factory.get("/admin/", {"category": str(self.cat1.pk)})
+        request.user = self.user
+
+        # No German translation: the label falls back to another language
+        with translation.override("de"), django_assert_num_queries(2):
+            flt = admin_instance.CategoryRelationListFilter(request, request.GET.copy(), TestModel, admin_instance)
+            label = flt.selected_category_label
+
+        assert label == self.cat1.safe_translation_getter("name", any_language=True)
+
     def test_category_list_filter_uses_custom_template(self) -> None:
         from tests.test_app.admin import TestModelAdmin
 
         admin_instance = TestModelAdmin(TestModel, AdminSite())
         assert "category_autocomplete_filter.html" in admin_instance.CategoryRelationListFilter.template
+
+    def test_save_related_only_touches_changed_relations(self) -> None:
+        from tests.test_app.admin import TestModelAdmin
+
+        cat3 = Category.objects.create(slug="cat3")
+        obj = TestModel.objects.create(title="Test")
+        content_type = ContentType.objects.get_for_model(TestModel)
+        kept = CategoryRelation.objects.create(
+            category=self.cat1,
+            content_type=content_type,
+            object_id=obj.pk,
+            order=0,
+        )
+        CategoryRelation.objects.create(
+            category=self.cat2,
+            content_type=content_type,
+            object_id=obj.pk,
+            order=1,
+        )
+
+        admin_instance = TestModelAdmin(TestModel, AdminSite())
+        request = self.factory.post(f"/admin/test_app/testmodel/{obj.pk}/change/")
+        request.user = self.user
+        form_class = admin_instance.get_form(request, obj)
+        form = form_class(
+            data={"title": "Test", "categories": [self.cat1.pk, cat3.pk]},
+            instance=obj,
+        )
+        assert form.is_valid(), form.errors
+        admin_instance.save_form(request, form, change=True)
+
+        admin_instance.save_related(request, form, [], change=True)
+
+        relations = CategoryRelation.objects.filter(content_type=content_type, object_id=obj.pk)
+        assert set(relations.values_list("category_id", flat=True)) == {self.cat1.pk, cat3.pk}
+        # The unchanged relation row is kept rather than deleted and re-created
+        assert relations.filter(pk=kept.pk).exists()
+
+    def test_save_related_skips_unchanged_categories(self, django_assert_num_queries) -> None:
+        from tests.test_app.admin import TestModelAdmin
+
+        obj = TestModel.objects.create(title="Test")
+        obj.categories.add(self.cat1, self.cat2)
+
+        admin_instance = TestModelAdmin(TestModel, AdminSite())
+        request = self.factory.post(f"/admin/test_app/testmodel/{obj.pk}/change/")
+        request.user = self.user
+        form = admin_instance.get_form(request, obj)(
+            data={"title": "Changed", "categories": [self.cat2.pk, self.cat1.pk]},
+            instance=obj,
+        )
+        assert form.is_valid(), form.errors
+        admin_instance.save_form(request, form, change=True)
+
+        with django_assert_num_queries(0):
+            admin_instance.save_related(request, form, [], change=True)
+
+    def test_get_queryset_prefetches_categories(self, django_assert_num_queries) -> None:
+        from tests.test_app.admin import TestModelAdmin
+
+        content_type = ContentType.objects.get_for_model(TestModel)
+        for i in range(3):
+            obj = TestModel.objects.create(title=f"Test {i}")
+            CategoryRelation.objects.create(category=self.cat1, content_type=content_type, object_id=obj.pk, order=0)
+            CategoryRelation.objects.create(category=self.cat2, content_type=content_type, object_id=obj.pk, order=1)
+
+        request = self.factory.get("/admin/test_app/testmodel/")
+        request.user = self.user
+        admin_instance = TestModelAdmin(TestModel, AdminSite())
+
+        with django_assert_num_queries(3):
+            result = [list(obj.categories.all()) for obj in admin_instance.get_queryset(request)]
+            names = [[category.name for category in categories] for categories in result]
+
+        assert result == [[self.cat1, self.cat2]] * 3
+        assert names == [[self.cat1.name, self.cat2.name]] * 3
+
+    def test_category_choices_do_not_query_per_option(self, django_assert_max_num_queries) -> None:
+        from tests.test_app.admin import TestModelAdmin
+
+        for i in range(5):
+            Category.objects.language("en").create(slug=f"child{i}", name=f"Child {i}", parent=self.cat1)
+
+        request = self.factory.get("/admin/test_app/testmodel/add/")
+        request.user = self.user
+        form = TestModelAdmin(TestModel, AdminSite()).get_form(request)()
+
+        with django_assert_max_num_queries(2):
+            labels = [label for _value, label in form.fields["categories"].choices]
+
+        assert "Child 0 (Category 1)" in labels
+
+    def test_category_choices_are_ordered(self) -> None:
+        from tests.test_app.admin import TestModelAdmin
+
+        request = self.factory.get("/admin/test_app/testmodel/add/")
+        request.user = self.user
+        field = TestModelAdmin(TestModel, AdminSite()).get_form(request)().fields["categories"]
+
+        assert field.queryset.ordered
+        assert [value for value, _label in field.choices] == [self.cat1.pk, self.cat2.pk]
+
+    def test_category_choice_iterator_orders_unordered_queryset(self) -> None:
+        from djangocms_taxonomy.mixins import CategoryMultipleChoiceField
+
+        field = CategoryMultipleChoiceField(queryset=Category.objects.all())
+        html = field.widget.render("categories", [], {"id": "id_categories"})
+
+        assert not field.queryset.ordered
+        assert html.index(f'value="{self.cat1.pk}"') < html.index(f'value="{self.cat2.pk}"')
+
+    def test_form_initial_uses_prefetched_relations(self, django_assert_num_queries) -> None:
+        from tests.test_app.admin import TestModelAdmin
+
+        obj = TestModel.objects.create(title="Test")
+        content_type = ContentType.objects.get_for_model(TestModel)
+        CategoryRelation.objects.create(category=self.cat2, content_type=content_type, object_id=obj.pk, order=0)
+
+        request = self.factory.get(f"/admin/test_app/testmodel/{obj.pk}/change/")
+        request.user = self.user
+        admin_instance = TestModelAdmin(TestModel, AdminSite())
+        obj = admin_instance.get_object(request, str(obj.pk))
+        form_class = admin_instance.get_form(request, obj)
+
+        with django_assert_num_queries(0):
+            form = form_class(instance=obj)
+
+        assert form.fields["categories"].initial == [self.cat2.pk]
+
+        # A write on the prefetched instance shows up in the next form
+        obj.categories.set([self.cat1])
+        assert form_class(instance=obj).fields["categories"].initial == [self.cat1.pk]
+
+    def test_get_fieldsets_appends_collapsed_categories(self) -> None:
+        from tests.test_app.admin import TestModelAdmin
+
+        request = self.factory.get("/admin/test_app/testmodel/add/")
+        request.user = self.user
+        fieldsets = TestModelAdmin(TestModel, AdminSite()).get_fieldsets(request)
+
+        _name, options = fieldsets[-1]
+        assert isinstance(fieldsets, list)
+        assert options["fields"] == ("categories",)
+        assert "collapse" in options["classes"]
+        assert all("categories" not in fs_options["fields"] for _name, fs_options in fieldsets[:-1])
+
+        # Mutating the returned fieldset must not leak into later requests
+        options["classes"] = ()
+        _name, options = TestModelAdmin(TestModel, AdminSite()).get_fieldsets(request)[-1]
+        assert "collapse" in options["classes"]
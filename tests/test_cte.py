@@ -1,208 +1,151 @@
 """Tests for CTE-based tree queries."""
+
 import pytest
+from django.utils import translation
+
 from djangocms_taxonomy.models import Category
 
 
+def make_cat(slug, name, parent=None):
+    """Create a category with its English name in a single save()."""
+    return Category.objects.language("en").create(slug=slug, name=name, parent=parent)
+
+
+@pytest.fixture
+def linear_tree(db):
+    """A root -> child -> grandchild chain."""
+    root = make_cat("root", "Root")
+    child = make_cat("child", "Child", parent=root)
+    grandchild = make_cat("grandchild", "Grandchild", parent=child)
+    return root, child, grandchild
+
+
 @pytest.mark.django_db
 class TestCategoryTreeQueries:
     """Test CTE-based hierarchical queries."""
 
     def test_with_tree_fields_root_only(self):
         """Test tree fields annotation with root category."""
-        root = Category.objects.create(slug="root")
-        root.set_current_language("en")
-        root.name = "Root"
-        root.save()
+        Category.objects.create(slug="root")
 
         categories = Category.objects.with_tree_fields()
 
         assert categories.count() == 1
         cat = categories.first()
-        assert cat.path == "Root"
+        assert cat.path == "root"
         assert cat.depth == 0
 
-    def test_with_tree_fields_hierarchy(self):
+    def test_with_tree_fields_hierarchy(self, django_assert_num_queries):
         """Test tree fields annotation with multi-level hierarchy."""
-        root = Category.objects.create(slug="electronics")
-        root.set_current_language("en")
-        root.name = "Electronics"
-        root.save()
-
-        child1 = Category.objects.create(slug="computers", parent=root)
-        child1.set_current_language("en")
-        child1.name = "Computers"
-        child1.save()
-
-        child2 = Category.objects.create(slug="phones", parent=root)
-        child2.set_current_language("en")
-        child2.name = "Phones"
-        child2.save()
-
-        grandchild = Category.objects.create(slug="laptops", parent=child1)
-        grandchild.set_current_language("en")
-        grandchild.name = "Laptops"
-        grandchild.save()
-
-        categories = list(Category.objects.with_tree_fields())
-
-        # Should be 4 categories
-        assert len(categories) == 4
-
-        # Check they are ordered by path (hierarchically)
-        paths = [cat.path for cat in categories]
-        assert paths == [
-            "Electronics",
-            "Electronics/computers",
-            "Electronics/computers/laptops",
-            "Electronics/phones",
+        root = make_cat("electronics", "Electronics")
+        child1 = make_cat("computers", "Computers", parent=root)
+        make_cat("phones", "Phones", parent=root)
+        make_cat("laptops", "Laptops", parent=child1)
+
+        with django_assert_num_queries(1):
+            rows = list(
+                Category.objects.with_tree_fields()
+                .filter(translations__language_code="en")
+                .values("path", "depth", "translations__name")
+                .order_by("path")
+            )
+
+        # Ordered by path (hierarchically)
+        assert [row["path"] for row in rows] == [
+            "electronics",
+            "electronics/computers",
+            "electronics/computers/laptops",
+            "electronics/phones",
         ]
+        assert {row["translations__name"]: row["depth"] for row in rows} == {
+            "Electronics": 0,
+            "Computers": 1,
+            "Phones": 1,
+            "Laptops": 2,
+        }
+
+    def test_with_tree_fields_is_single_query(self, django_assert_num_queries):
+        """Test that the whole tree is read in one query, however deep it is."""
+        root = Category.objects.create(slug="root")
+        child = Category.objects.create(slug="child", parent=root)
+        grandchild = Category.objects.create(slug="grandchild", parent=child)
+        Category.objects.create(slug="great-grandchild", parent=grandchild)
+
+        with django_assert_num_queries(1):
+            rows = list(Category.objects.with_tree_fields().values("pk", "path", "depth"))
 
-        # Check depths
-        depths = {cat.name: cat.depth for cat in categories}
-        assert depths["Electronics"] == 0
-        assert depths["Computers"] == 1
-        assert depths["Phones"] == 1
-        assert depths["Laptops"] == 2
+        assert [row["depth"] for row in rows] == [0, 1, 2, 3]
 
-    def test_with_tree_fields_multiple_roots(self):
+    def test_with_tree_fields_multiple_roots(self, django_assert_num_queries):
         """Test tree fields with multiple root categories."""
         root1 = Category.objects.create(slug="books")
-        root1.set_current_language("en")
-        root1.name = "Books"
-        root1.save()
-
         root2 = Category.objects.create(slug="movies")
-        root2.set_current_language("en")
-        root2.name = "Movies"
-        root2.save()
+        Category.objects.create(slug="fiction", parent=root1)
+        Category.objects.create(slug="action", parent=root2)
 
-        child1 = Category.objects.create(slug="fiction", parent=root1)
-        child1.set_current_language("en")
-        child1.name = "Fiction"
-        child1.save()
-
-        child2 = Category.objects.create(slug="action", parent=root2)
-        child2.set_current_language("en")
-        child2.name = "Action"
-        child2.save()
-
-        categories = list(Category.objects.with_tree_fields())
+        with django_assert_num_queries(1):
+            categories = list(Category.objects.with_tree_fields())
 
         assert len(categories) == 4
 
         # Verify ordering keeps children under parents
         paths = [cat.path for cat in categories]
         assert paths == [
-            "Books",
-            "Books/fiction",
-            "Movies",
-            "Movies/action",
+            "books",
+            "books/fiction",
+            "movies",
+            "movies/action",
         ]
 
-    def test_with_tree_fields_filter_by_depth(self):
+    def test_with_tree_fields_filter_by_depth(self, linear_tree):
         """Test filtering annotated queryset by depth."""
-        root = Category.objects.create(slug="root")
-        root.set_current_language("en")
-        root.name = "Root"
-        root.save()
-
-        child = Category.objects.create(slug="child", parent=root)
-        child.set_current_language("en")
-        child.name = "Child"
-        child.save()
-
-        grandchild = Category.objects.create(slug="grandchild", parent=child)
-        grandchild.set_current_language("en")
-        grandchild.name = "Grandchild"
-        grandchild.save()
-
         # Get only depth 1 categories
         depth_1 = Category.objects.with_tree_fields().filter(depth=1)
 
         assert depth_1.count() == 1
         assert depth_1.first().name == "Child"
 
-    def test_with_tree_fields_order_by_path(self):
+    def test_with_tree_fields_order_by_path(self, django_assert_num_queries):
         """Test that results are ordered by path by default."""
         # Create in random order
-        cat_b = Category.objects.create(slug="b")
-        cat_b.set_current_language("en")
-        cat_b.name = "B"
-        cat_b.save()
+        make_cat("b", "B")
+        make_cat("a", "A")
+        make_cat("c", "C")
 
-        cat_a = Category.objects.create(slug="a")
-        cat_a.set_current_language("en")
-        cat_a.name = "A"
-        cat_a.save()
+        with django_assert_num_queries(2):
+            categories = list(Category.objects.with_tree_fields().prefetch_related("translations"))
+            names = [cat.name for cat in categories]
 
-        cat_c = Category.objects.create(slug="c")
-        cat_c.set_current_language("en")
-        cat_c.name = "C"
-        cat_c.save()
-
-        categories = list(Category.objects.with_tree_fields())
-        names = [cat.name for cat in categories]
-
-        # Should be alphabetically ordered by path (which equals name for roots)
+        # Should be alphabetically ordered by path (which equals slug for roots)
         assert names == ["A", "B", "C"]
 
     def test_roots_queryset(self):
         """Test roots() queryset method."""
-        root1 = Category.objects.create(slug="root1")
-        root1.set_current_language("en")
-        root1.name = "Root1"
-        root1.save()
-
-        root2 = Category.objects.create(slug="root2")
-        root2.set_current_language("en")
-        root2.name = "Root2"
-        root2.save()
-
-        child = Category.objects.create(slug="child", parent=root1)
-        child.set_current_language("en")
-        child.name = "Child"
-        child.save()
+        root1 = make_cat("root1", "Root1")
+        make_cat("root2", "Root2")
+        make_cat("child", "Child", parent=root1)
 
-        roots = Category.objects.roots()
+        roots = list(Category.objects.roots().prefetch_related("translations"))
 
-        assert roots.count() == 2
-        assert set(roots.values_list("translations__name", flat=True)) == {"Root1", "Root2"}
+        assert len(roots) == 2
+        assert {root.safe_translation_getter("name") for root in roots} == {"Root1", "Root2"}
 
     def test_leaves_queryset(self):
         """Test leaves() queryset method."""
-        root = Category.objects.create(slug="root")
-        root.set_current_language("en")
-        root.name = "Root"
-        root.save()
-
-        child1 = Category.objects.create(slug="child1", parent=root)
-        child1.set_current_language("en")
-        child1.name = "Child1"
-        child1.save()
+        root = make_cat("root", "Root")
+        child1 = make_cat("child1", "Child1", parent=root)
+        make_cat("child2", "Child2", parent=root)
+        make_cat("grandchild", "Grandchild", parent=child1)
 
-        child2 = Category.objects.create(slug="child2", parent=root)
-        child2.set_current_language("en")
-        child2.name = "Child2"
-        child2.save()
-
-        grandchild = Category.objects.create(slug="grandchild", parent=child1)
-        grandchild.set_current_language("en")
-        grandchild.name = "Grandchild"
-        grandchild.save()
-
-        leaves = Category.objects.leaves()
+        leaves = list(Category.objects.leaves().prefetch_related("translations"))
 
         # Child2 and Grandchild are leaves (no children)
-        assert leaves.count() == 2
-        assert set(leaves.values_list("translations__name", flat=True)) == {"Child2", "Grandchild"}
+        assert len(leaves) == 2
+        assert {leaf.safe_translation_getter("name") for leaf in leaves} == {"Child2", "Grandchild"}
 
     def test_with_tree_fields_preserves_all_fields(self):
         """Test that with_tree_fields preserves all model fields."""
-        root = Category.objects.create(slug="test")
-        root.set_current_language("en")
-        root.name = "Test"
-        root.description = "Test description"
-        root.save()
+        Category.objects.language("en").create(slug="test", name="Test", description="Test description")
 
         cat = Category.objects.with_tree_fields().first()
 
@@ -212,35 +155,215 @@ class TestCategoryTreeQueries:
         assert hasattr(cat, "path")
         assert hasattr(cat, "depth")
 
-    def test_descendants_of_returns_all_descendants(self):
+    @pytest.mark.parametrize(
+        "start, include_self, expected",
+        [
+            (0, False, {"child", "grandchild"}),
+            (0, True, {"root", "child", "grandchild"}),
+            (1, False, {"grandchild"}),
+            (2, False, set()),
+            (2, True, {"grandchild"}),
+        ],
+    )
+    def test_descendants_of(self, linear_tree, start, include_self, expected):
+        descendants = Category.objects.descendants_of(linear_tree[start], include_self=include_self)
+        assert set(descendants.values_list("slug", flat=True)) == expected
+
+    def test_descendant_ids_of(self):
         root = Category.objects.create(slug="root")
-        root.set_current_language("en")
-        root.name = "Root"
-        root.save()
+        child = Category.objects.create(slug="child", parent=root)
+        grandchild = Category.objects.create(slug="grandchild", parent=child)
+        Category.objects.create(slug="other")
 
+        assert sorted(Category.objects.descendant_ids_of(root)) == sorted([child.pk, grandchild.pk])
+        assert sorted(Category.objects.descendant_ids_of(child.pk, include_self=True)) == sorted(
+            [child.pk, grandchild.pk]
+        )
+
+    def test_descendants_of_many(self):
+        root = Category.objects.create(slug="root")
         child = Category.objects.create(slug="child", parent=root)
-        child.set_current_language("en")
-        child.name = "Child"
+        Category.objects.create(slug="grandchild", parent=child)
+        other = Category.objects.create(slug="other")
+        Category.objects.create(slug="other-child", parent=other)
+        Category.objects.create(slug="unrelated")
+
+        descendants = Category.objects.descendants_of_many([child, other.pk])
+        assert set(descendants.values_list("slug", flat=True)) == {"grandchild", "other-child"}
+
+        # Overlapping subtrees are only returned once
+        descendants = Category.objects.descendants_of_many([root, child], include_self=True)
+        assert sorted(descendants.values_list("slug", flat=True)) == ["child", "grandchild", "root"]
+
+    def test_tree_fields_map(self, django_assert_num_queries):
+        root = Category.objects.language("en").create(slug="root", name="Root")
+        child = Category.objects.language("en").create(slug="child", name="Child", parent=root)
+
+        with django_assert_num_queries(1):
+            tree = Category.objects.tree_fields_map()
+
+        assert tree == {root.pk: ("root", 0), child.pk: ("root/child", 1)}
+
+    def test_tree_path_follows_moves(self, settings):
+        settings.TAXONOMY_USE_MATERIALIZED_PATH = True
+        root = Category.objects.create(slug="root")
+        child = Category.objects.create(slug="child", parent=root)
+        grandchild = Category.objects.create(slug="grandchild", parent=child)
+        other = Category.objects.create(slug="other")
+
+        assert grandchild.tree_path == f"/{root.pk}/{child.pk}/{grandchild.pk}/"
+        assert grandchild.tree_depth == 2
+
+        child.parent = other
         child.save()
 
+        grandchild.refresh_from_db()
+        assert grandchild.tree_path == f"/{other.pk}/{child.pk}/{grandchild.pk}/"
+        assert grandchild.tree_depth == 2
+
+        child.parent = None
+        child.save()
+
+        grandchild.refresh_from_db()
+        assert grandchild.tree_path == f"/{child.pk}/{grandchild.pk}/"
+        assert grandchild.tree_depth == 1
+
+    def test_tree_path_reads_parent_path_from_database(self, settings):
+        settings.TAXONOMY_USE_MATERIALIZED_PATH = True
+        root = Category.objects.create(slug="root")
+        parent = Category.objects.create(slug="parent")
+        stale_parent = Category.objects.get(pk=parent.pk)
+        parent.parent = root
+        parent.save()
+
+        child = Category.objects.create(slug="child", parent=stale_parent)
+
+        assert child.tree_path == f"/{root.pk}/{parent.pk}/{child.pk}/"
+
+    def test_tree_path_not_maintained_without_setting(self, settings, django_assert_num_queries):
+        root = Category.objects.create(slug="root")
+
+        with django_assert_num_queries(1):
+            child = Category(slug="child", parent=root)
+            child.save()
+
+        assert Category.objects.get(pk=child.pk).tree_path == ""
+
+        # Enabling the setting later recomputes the missing paths on save()
+        settings.TAXONOMY_USE_MATERIALIZED_PATH = True
+        grandchild = Category.objects.create(slug="grandchild", parent=child)
+
+        assert grandchild.tree_path == f"/{root.pk}/{child.pk}/{grandchild.pk}/"
+        assert Category.objects.get(pk=child.pk).tree_path == f"/{root.pk}/{child.pk}/"
+
+    def test_rebuild_tree_paths(self, settings):
+        settings.TAXONOMY_USE_MATERIALIZED_PATH = True
+        root = Category.objects.create(slug="root")
+        child = Category.objects.create(slug="child", parent=root)
+        Category.objects.filter(pk=child.pk).update(tree_path="", tree_depth=0)
+
+        assert Category.objects.rebuild_tree_paths() == 1
+        child.refresh_from_db()
+        assert (child.tree_path, child.tree_depth) == (f"/{root.pk}/{child.pk}/", 1)
+
+    @pytest.mark.parametrize("materialized", [False, True])
+    def test_descendants_with_and_without_materialized_path(self, settings, materialized):
+        settings.TAXONOMY_USE_MATERIALIZED_PATH = materialized
+        root = Category.objects.create(slug="root")
+        child = Category.objects.create(slug="child", parent=root)
         grandchild = Category.objects.create(slug="grandchild", parent=child)
-        grandchild.set_current_language("en")
-        grandchild.name = "Grandchild"
-        grandchild.save()
+        other = Category.objects.create(slug="other")
+        Category.objects.create(slug="other-child", parent=other)
 
-        descendants = Category.objects.descendants_of(root)
-        assert set(descendants.values_list("slug", flat=True)) == {"child", "grandchild"}
+        assert set(Category.objects.descendants_of(root).values_list("slug", flat=True)) == {"child", "grandchild"}
+        assert sorted(Category.objects.descendant_ids_of(child.pk, include_self=True)) == [child.pk, grandchild.pk]
+        descendants = Category.objects.descendants_of_many([child, other.pk])
+        assert set(descendants.values_list("slug", flat=True)) == {"grandchild", "other-child"}
 
-    def test_descendants_of_include_self(self):
+    def test_descendants_fall_back_to_cte_for_missing_paths(self, settings):
         root = Category.objects.create(slug="root")
-        root.set_current_language("en")
-        root.name = "Root"
+        Category.objects.create(slug="child", parent=root)
+        Category.objects.create(slug="other")
+        settings.TAXONOMY_USE_MATERIALIZED_PATH = True
+
+        # The paths were never stored, so an empty prefix must not match everything
+        assert list(Category.objects.descendants_of(root).values_list("slug", flat=True)) == ["child"]
+        assert Category.objects.descendant_ids_of(root.pk) == [Category.objects.get(slug="child").pk]
+
+    def test_with_tree_fields_one_row_per_category(self):
+        """Test that translations in several languages do not duplicate rows."""
+        root = Category.objects.language("en").create(slug="root", name="Root")
+        root.set_current_language("de")
+        root.name = "Wurzel"
         root.save()
+        Category.objects.language("en").create(slug="child", name="Child", parent=root)
+
+        assert [cat.path for cat in Category.objects.with_tree_fields()] == ["root", "root/child"]
+
+    def test_iter_tree(self):
+        root = Category.objects.create(slug="root")
+        Category.objects.create(slug="child", parent=root)
+
+        assert [(cat.path, cat.depth) for cat in Category.objects.iter_tree(chunk_size=1)] == [
+            ("root", 0),
+            ("root/child", 1),
+        ]
+
+    def test_descendants_of_survives_parent_cycle(self):
+        first = Category.objects.create(slug="first")
+        second = Category.objects.create(slug="second", parent=first)
+        # Bypass save() and form validation to create a cycle
+        Category.objects.filter(pk=first.pk).update(parent=second)
+
+        assert sorted(Category.objects.descendant_ids_of(first)) == sorted([first.pk, second.pk])
+
+    def test_tree_cte_is_built_once_and_reused(self):
+        root = Category.objects.create(slug="root")
+        Category.objects.create(slug="child", parent=root)
+
+        first = Category.objects.with_tree_fields()
+        second = Category.objects.with_tree_fields().filter(depth=1)
 
+        assert first.query._with_ctes[0].query is not second.query._with_ctes[0].query
+        assert [cat.path for cat in first] == ["root", "root/child"]
+        assert [cat.path for cat in second] == ["root/child"]
+        assert Category.objects.tree_fields_map()[root.pk] == ("root", 0)
+
+    def test_cte_branches_are_unordered(self):
+        root = Category.objects.create(slug="root")
+
+        assert "ORDER BY" not in str(Category.objects.descendant_ids_query([root]).query)
+        assert "ORDER BY" not in str(Category.objects.with_tree_fields().order_by().query)
+
+    def test_cached_tree(self, django_assert_num_queries):
+        root = Category.objects.create(slug="root")
         child = Category.objects.create(slug="child", parent=root)
-        child.set_current_language("en")
-        child.name = "Child"
+
+        assert [cat.path for cat in Category.objects.cached_tree()] == ["root", "root/child"]
+        with django_assert_num_queries(1):
+            assert [cat.path for cat in Category.objects.cached_tree()] == ["root", "root/child"]
+
+        child.slug = "renamed"
         child.save()
+        assert [cat.path for cat in Category.objects.cached_tree()] == ["root", "root/renamed"]
+
+        child.delete()
+        assert [cat.path for cat in Category.objects.cached_tree()] == ["root"]
+
+    def test_cached_tree_per_language(self):
+        root = Category.objects.language("en").create(slug="root", name="Root")
+        root.set_current_language("de")
+        root.name = "Wurzel"
+        root.save()
+
+        with translation.override("de"):
+            assert [cat.name for cat in Category.objects.cached_tree()] == ["Wurzel"]
+        with translation.override("en"):
+            assert [cat.name for cat in Category.objects.cached_tree()] == ["Root"]
+
+    def test_cached_tree_skips_large_trees(self, django_assert_num_queries):
+        Category.objects.create(slug="root")
+        Category.objects.cached_tree(max_size=0)
 
-        descendants = Category.objects.descendants_of(root, include_self=True)
-        assert set(descendants.values_list("slug", flat=True)) == {"root", "child"}
+        with django_assert_num_queries(2):
+            Category.objects.cached_tree(max_size=0)
@@ -1,33 +1,28 @@
 """Tests for CategoryMixin model mixin."""
 
+import copy
+
 import pytest
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 
+from djangocms_taxonomy.mixins import clear_content_type_cache
 from djangocms_taxonomy.models import Category, CategoryRelation
 from tests.test_app.models import TestModel
 
 
+def _cat_pks(queryset):
+    """Return the primary keys of a category queryset as a set."""
+    return set(queryset.values_list("pk", flat=True))
+
+
 @pytest.mark.django_db
 class TestCategoryMixin:
     """Test CategoryMixin functionality."""
 
-    def setup_method(self) -> None:
-        """Set up test data."""
-        # Create test categories
-        self.cat1 = Category.objects.create(slug="cat1")
-        self.cat1.set_current_language("en")
-        self.cat1.name = "Category 1"
-        self.cat1.save()
-
-        self.cat2 = Category.objects.create(slug="cat2")
-        self.cat2.set_current_language("en")
-        self.cat2.name = "Category 2"
-        self.cat2.save()
-
-        self.cat3 = Category.objects.create(slug="cat3")
-        self.cat3.set_current_language("en")
-        self.cat3.name = "Category 3"
-        self.cat3.save()
+    @pytest.fixture(autouse=True)
+    def _use_base_categories(self, base_categories) -> None:
+        self.cat1, self.cat2, self.cat3 = base_categories
 
     def test_categories_property_returns_queryset(self) -> None:
         """Test that categories property returns a QuerySet."""
@@ -43,100 +38,66 @@ class TestCategoryMixin:
         """Test that categories returns empty queryset when no relations exist."""
         obj = TestModel.objects.create(title="Test")
 
-        categories = obj.categories.all()
-        assert categories.count() == 0
+        assert list(obj.categories.all()) == []
 
-    def test_categories_property_returns_related_categories(self) -> None:
+    def test_categories_property_returns_related_categories(self, test_model_ct) -> None:
         """Test that categories property returns related categories."""
         obj = TestModel.objects.create(title="Test")
-        content_type = ContentType.objects.get_for_model(TestModel)
 
         # Create relations
         CategoryRelation.objects.create(
             category=self.cat1,
-            content_type=content_type,
+            content_type=test_model_ct,
             object_id=obj.pk,
             order=0,
         )
         CategoryRelation.objects.create(
             category=self.cat2,
-            content_type=content_type,
+            content_type=test_model_ct,
             object_id=obj.pk,
             order=1,
         )
 
-        # Get categories
-        categories = obj.categories.all()
+        pks = _cat_pks(obj.categories.all())
 
-        assert categories.count() == 2
-        assert self.cat1 in categories
-        assert self.cat2 in categories
-        assert self.cat3 not in categories
+        assert pks == {self.cat1.pk, self.cat2.pk}
+        assert self.cat3.pk not in pks
 
-    def test_categories_property_multiple_objects(self) -> None:
+    def test_categories_property_multiple_objects(self, test_model_ct) -> None:
         """Test that categories are correctly isolated between objects."""
         obj1 = TestModel.objects.create(title="Test 1")
         obj2 = TestModel.objects.create(title="Test 2")
-        content_type = ContentType.objects.get_for_model(TestModel)
-
-        # Create relations for obj1
-        CategoryRelation.objects.create(
-            category=self.cat1,
-            content_type=content_type,
-            object_id=obj1.pk,
-            order=0,
-        )
 
-        # Create relations for obj2
-        CategoryRelation.objects.create(
-            category=self.cat2,
-            content_type=content_type,
-            object_id=obj2.pk,
-            order=0,
-        )
-        CategoryRelation.objects.create(
-            category=self.cat3,
-            content_type=content_type,
-            object_id=obj2.pk,
-            order=1,
+        # cat1 for obj1, cat2 and cat3 for obj2
+        CategoryRelation.objects.bulk_create(
+            [
+                CategoryRelation(category=self.cat1, content_type=test_model_ct, object_id=obj1.pk, order=0),
+                CategoryRelation(category=self.cat2, content_type=test_model_ct, object_id=obj2.pk, order=0),
+                CategoryRelation(category=self.cat3, content_type=test_model_ct, object_id=obj2.pk, order=1),
+            ]
         )
 
-        # Verify obj1 has only cat1
-        categories1 = obj1.categories.all()
-        assert categories1.count() == 1
-        assert self.cat1 in categories1
-
-        # Verify obj2 has cat2 and cat3
-        categories2 = obj2.categories.all()
-        assert categories2.count() == 2
-        assert self.cat2 in categories2
-        assert self.cat3 in categories2
+        # Verify obj1 has only cat1 and obj2 has cat2 and cat3
+        assert _cat_pks(obj1.categories.all()) == {self.cat1.pk}
+        assert _cat_pks(obj2.categories.all()) == {self.cat2.pk, self.cat3.pk}
 
     def test_categories_property_before_save(self) -> None:
         """Test that categories returns empty queryset for unsaved objects."""
         obj = TestModel(title="Test")
 
         # Should return empty queryset for unsaved object
-        categories = obj.categories.all()
-        assert categories.count() == 0
+        assert list(obj.categories.all()) == []
 
-    def test_categories_property_queryset_methods(self) -> None:
+    def test_categories_property_queryset_methods(self, test_model_ct) -> None:
         """Test that returned queryset supports standard QuerySet methods."""
         obj = TestModel.objects.create(title="Test")
-        content_type = ContentType.objects.get_for_model(TestModel)
 
         # Create relations
-        CategoryRelation.objects.create(
-            category=self.cat1,
-            content_type=content_type,
-            object_id=obj.pk,
-            order=0,
-        )
-        CategoryRelation.objects.create(
-            category=self.cat2,
-            content_type=content_type,
-            object_id=obj.pk,
-            order=1,
+        CategoryRelation.objects.bulk_create(
+            [
+                CategoryRelation(category=self.cat1, content_type=test_model_ct, object_id=obj.pk, order=0),
+                CategoryRelation(category=self.cat2, content_type=test_model_ct, object_id=obj.pk, order=1),
+            ]
         )
 
         # Test filter
@@ -152,7 +113,7 @@ class TestCategoryMixin:
         # Test exists
         assert obj.categories.exists()
 
-    def test_categories_property_with_hierarchical_categories(self) -> None:
+    def test_categories_property_with_hierarchical_categories(self, test_model_ct) -> None:
         """Test categories property with hierarchical category structure."""
         # Create parent category
         parent = Category.objects.create(slug="parent")
@@ -167,19 +128,215 @@ class TestCategoryMixin:
         child.save()
 
         obj = TestModel.objects.create(title="Test")
-        content_type = ContentType.objects.get_for_model(TestModel)
 
         # Relate to child category
         CategoryRelation.objects.create(
             category=child,
-            content_type=content_type,
+            content_type=test_model_ct,
+            object_id=obj.pk,
+            order=0,
+        )
+
+        pks = _cat_pks(obj.categories.all())
+
+        assert pks == {child.pk}
+        assert parent.pk not in pks
+
+    def test_category_relations_deleted_with_object(self, test_model_ct) -> None:
+        """Test that relations are removed together with the categorized object."""
+        obj = TestModel.objects.create(title="Test")
+        CategoryRelation.objects.create(
+            category=self.cat1,
+            content_type=test_model_ct,
             object_id=obj.pk,
             order=0,
         )
 
-        # Get categories
-        categories = obj.categories.all()
+        assert list(obj.category_relations.values_list("category_id", flat=True)) == [self.cat1.pk]
+
+        obj.delete()
+
+        assert not CategoryRelation.objects.filter(content_type=test_model_ct).exists()
+
+    def test_content_type_cached_per_class(self) -> None:
+        """Test that managers of the same model share one cached ContentType."""
+        clear_content_type_cache()
+        obj1 = TestModel.objects.create(title="Test 1")
+        obj2 = TestModel.objects.create(title="Test 2")
+
+        content_type = obj1.categories.content_type
+
+        assert content_type == ContentType.objects.get_for_model(TestModel)
+        assert obj2.categories.content_type is content_type
+
+    def test_categories_all_ordered_by_relation_order(self, test_model_ct) -> None:
+        """Test that all() returns categories in relation order using a single query."""
+        obj = TestModel.objects.create(title="Test")
+        for order, category in enumerate([self.cat3, self.cat1, self.cat2]):
+            CategoryRelation.objects.create(
+                category=category,
+                content_type=test_model_ct,
+                object_id=obj.pk,
+                order=order,
+            )
+
+        queryset = obj.categories.all()
+
+        assert "IN (SELECT" not in str(queryset.query).upper()
+        assert list(queryset) == [self.cat3, self.cat1, self.cat2]
+
+    def test_bool_and_count_do_not_join_categories(self, django_assert_num_queries) -> None:
+        """Test that existence and count checks only read the relation table."""
+        obj = TestModel.objects.create(title="Test")
+        obj.categories.add(self.cat1, self.cat2)
 
-        assert categories.count() == 1
-        assert child in categories
-        assert parent not in categories
+        with django_assert_num_queries(2) as captured:
+            assert obj.categories
+            assert obj.categories.count() == 2
+
+        for query in captured.captured_queries:
+            assert "djangocms_taxonomy_category" not in query["sql"].replace("djangocms_taxonomy_categoryrelation", "")
+
+    def test_bool_and_count_after_write_on_prefetched_instance(self, django_assert_num_queries) -> None:
+        """Test that prefetched answers are not reused once the categories changed."""
+        TestModel.objects.create(title="Test").categories.add(self.cat1)
+        obj = TestModel.objects.prefetch_related("category_relations").get()
+
+        with django_assert_num_queries(0):
+            assert obj.categories
+            assert obj.categories.count() == 1
+
+        obj.categories.add(self.cat2, self.cat3)
+        assert obj.categories.count() == 3
+
+        obj.categories.clear()
+        assert not obj.categories
+        assert obj.categories.count() == 0
+
+    def test_add_appends_in_order_and_skips_existing(self) -> None:
+        """Test that add() continues the order sequence and ignores known categories."""
+        obj = TestModel.objects.create(title="Test")
+        obj.categories.add(self.cat1)
+
+        obj.categories.add(self.cat1, self.cat2, self.cat3, self.cat2)
+
+        orders = dict(obj.category_relations.values_list("category_id", "order"))
+        assert orders == {self.cat1.pk: 1, self.cat2.pk: 2, self.cat3.pk: 3}
+
+    def test_set_keeps_unchanged_relations(self) -> None:
+        """Test that set() only deletes and inserts the relations that changed."""
+        obj = TestModel.objects.create(title="Test")
+        obj.categories.add(self.cat1, self.cat2)
+        kept = obj.category_relations.get(category=self.cat1)
+
+        obj.categories.set([self.cat3, self.cat1])
+
+        assert list(obj.categories.all()) == [self.cat3, self.cat1]
+        assert obj.category_relations.get(category=self.cat1).pk == kept.pk
+
+    def test_categories_manager_reused_per_instance(self) -> None:
+        """Test that the manager is cached per instance but not shared with copies."""
+        obj = TestModel.objects.create(title="Test")
+
+        assert obj.categories is obj.categories
+
+        clone = copy.copy(obj)
+        assert clone.categories is not obj.categories
+        assert clone.categories.instance is clone
+
+    def test_categories_manager_does_not_proxy_private_names(self) -> None:
+        """Test that private attribute probes are not forwarded to a queryset."""
+        obj = TestModel.objects.create(title="Test")
+        obj.categories.add(self.cat1)
+
+        assert not hasattr(obj.categories, "_meta")
+        assert obj.categories.filter(slug="cat1").get() == self.cat1
+        assert obj.categories.exists()
+
+    def test_set_without_upsert_support(self, monkeypatch) -> None:
+        """Test that set() falls back to a diff when the backend has no upsert."""
+        monkeypatch.setattr(connection.features, "supports_update_conflicts", False)
+        obj = TestModel.objects.create(title="Test")
+        obj.categories.set([self.cat1, self.cat2])
+
+        obj.categories.set([self.cat2, self.cat3, self.cat1])
+
+        assert list(obj.categories.all()) == [self.cat2, self.cat3, self.cat1]
+
+    def test_clear_is_a_single_delete(self, django_assert_num_queries) -> None:
+        """Test that clear() deletes without collecting the relations first."""
+        obj = TestModel.objects.create(title="Test")
+        obj.categories.add(self.cat1, self.cat2, self.cat3)
+
+        with django_assert_num_queries(1) as captured:
+            obj.categories.clear()
+
+        assert captured.captured_queries[0]["sql"].startswith("DELETE")
+        assert not obj.categories
+
+    def test_native_prefetch_through_generic_relation(self, django_assert_num_queries) -> None:
+        """Test that prefetch_related('category_relations__category') feeds categories.all()."""
+        for i in range(3):
+            TestModel.objects.create(title=f"Test {i}").categories.add(self.cat1, self.cat2)
+
+        with django_assert_num_queries(3):
+            result = [
+                list(obj.categories.all())
+                for obj in TestModel.objects.prefetch_related("category_relations__category")
+            ]
+
+        assert result == [[self.cat1, self.cat2]] * 3
+
+    def test_writes_drop_prefetched_relations(self) -> None:
+        """Test that add/remove/set/clear are visible on a prefetched instance."""
+        TestModel.objects.create(title="Test").categories.add(self.cat1)
+        obj = TestModel.objects.prefetch_related("category_relations__category").get()
+
+        obj.categories.add(self.cat2)
+        assert list(obj.categories.all()) == [self.cat1, self.cat2]
+
+        obj = TestModel.objects.prefetch_related("category_relations__category").get()
+        obj.categories.remove(self.cat1)
+        assert list(obj.categories.all()) == [self.cat2]
+
+        obj = TestModel.objects.prefetch_related("category_relations__category").get()
+        obj.categories.set([self.cat3, self.cat1])
+        assert list(obj.categories.all()) == [self.cat3, self.cat1]
+        assert obj.categories.count() == 2
+
+        obj = TestModel.objects.prefetch_related("category_relations__category").get()
+        obj.categories.clear()
+        assert list(obj.categories.all()) == []
+        assert obj.categories.count() == 0
+        assert not obj.categories
+
+    def test_relations_ordered_by_name(self, test_model_ct) -> None:
+        """Test that ordered_by_name() breaks order ties by translated name."""
+        obj = TestModel.objects.create(title="Test")
+        for category in (self.cat3, self.cat1, self.cat2):
+            CategoryRelation.objects.create(category=category, content_type=test_model_ct, object_id=obj.pk, order=0)
+
+        relations = CategoryRelation.objects.filter(object_id=obj.pk)
+
+        assert "translation" not in str(relations.query)
+        assert [relation.category for relation in relations.ordered_by_name()] == [self.cat1, self.cat2, self.cat3]
+
+    def test_relations_with_content_objects(self, django_assert_num_queries) -> None:
+        """Test that related objects are loaded with one query per content type."""
+        objs = [TestModel.objects.create(title=f"Test {i}") for i in range(3)]
+        for obj in objs:
+            obj.categories.add(self.cat1)
+        CategoryRelation.objects.create(
+            category=self.cat1, content_type=ContentType.objects.get_for_model(Category), object_id=self.cat2.pk
+        )
+
+        with django_assert_num_queries(3):
+            relations = list(CategoryRelation.objects.filter(category=self.cat1).with_content_objects())
+            assert {relation.content_object for relation in relations} == {*objs, self.cat2}
+
+        relations = CategoryRelation.objects.filter(category=self.cat1).with_content_objects(
+            TestModel.objects.only("title")
+        )
+        with django_assert_num_queries(3):
+            titles = [relation.content_object.title for relation in relations if relation.content_object != self.cat2]
+        assert sorted(titles) == ["Test 0", "Test 1", "Test 2"]
@@ -1,7 +1,8 @@
 import pytest
 from django.test import TestCase
+from django.utils.text import slugify
 
-from djangocms_taxonomy.models import Category, CategoryRelation
+from djangocms_taxonomy.models import Category, CategoryRelation, _slugify
 from tests.test_app.models import TestModel
 
 
@@ -55,6 +56,11 @@ class CategoryModelTests(TestCase):
 
         self.assertEqual(category.slug, "test-category-name")
 
+    def test_slugify_matches_django(self):
+        """Test that the slugifier used by save() gives the same slugs as Django's."""
+        for name in ["Test Category Name", "Électronique & Téléphones", " --Über_Größe-- ", "日本語 tag", "a\tb  c"]:
+            self.assertEqual(_slugify(name), slugify(name))
+
     def test_get_children(self):
         """Test retrieving child categories."""
         children = self.root_category.children.all()
@@ -1 +1,26 @@
 # Test utilities
+from djangocms_taxonomy.models import Category
+
+
+def make_categories(specs, language_code="en"):
+    """
+    Create root categories with a translated name in a few bulk queries.
+
+    Args:
+        specs: Iterable of ``(slug, name)`` tuples.
+        language_code: Language of the names.
+
+    Returns:
+        List of the created categories, in the order of ``specs``.
+    """
+    specs = list(specs)
+    categories = Category.objects.bulk_create([Category(slug=slug) for slug, _name in specs])
+    Category._parler_meta.root_model.objects.bulk_create(
+        [
+            Category._parler_meta.root_model(master_id=category.pk, language_code=language_code, name=name)
+            for category, (_slug, name) in zip(categories, specs)
+        ]
+    )
+    # bulk_create() bypasses Category.save()
+    Category.objects.rebuild_tree_paths()
+    return categories